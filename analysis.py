@@ -0,0 +1,81 @@
+import time
+from typing import NamedTuple
+
+from diff_engine import diff_lines, diff_lines_ordered
+from hotfix_parser import parse_diff, extract_strings
+from ini_model import resolve_sections, semantic_diff
+from section_index import section_table, changed_chunks, chunk_lines, section_spans
+
+
+class AnalysisTask(NamedTuple):
+    friendly_name: str
+    old_data:      bytes
+    new_data:      bytes
+    old_table:     list
+    diff_mode:     str
+
+
+class AnalysisResult(NamedTuple):
+    new_table:       list
+    added:           list
+    removed:         list
+    moved:           list
+    semantic:        list
+    modifications:   list
+    strings_added:   list
+    strings_removed: list
+    parsed_total:    int
+    chunks_changed:  int
+    sections:        int
+    diff_time:       float
+    parse_time:      float
+
+
+def semantic_changes(old_data, old_table, new_data, new_table, names):
+    before = resolve_sections(s for s in section_spans(old_data, old_table) if s[0] in names)
+    after  = resolve_sections(s for s in section_spans(new_data, new_table) if s[0] in names)
+    return semantic_diff(before, after, sorted(names))
+
+
+def modification_records(parsed):
+    return [
+        *[{"type":"String","key":k,"value":t} for k,t in parsed.strings],
+        *[{"type":"DataTable","path":p,"row_name":r,"field":f,"new_value":v,"change":("Added" if s=="+" else "Removed")} for p,r,f,v,s in parsed.dt_plus+parsed.dt_minus],
+        *[{"type":"CurveTable","path":p,"row_name":r,"field":f,"new_value":v,"change":("Added" if s=="+" else "Removed")} for p,r,f,v,s in parsed.ct_plus+parsed.ct_minus],
+    ]
+
+
+def file_strings(data):
+    return extract_strings(bytes(data).decode("utf-8").splitlines(keepends=True))
+
+
+def analyze(task):
+    started   = time.perf_counter()
+    new_table = section_table(task.new_data)
+    old_spans, new_spans = changed_chunks(task.old_table, new_table)
+    old_part  = chunk_lines(task.old_data, old_spans)
+    new_part  = chunk_lines(task.new_data, new_spans)
+    moved     = []
+    if task.diff_mode == "ordered":
+        added, removed, moved = diff_lines_ordered(old_part, new_part)
+    else:
+        added, removed = diff_lines(old_part, new_part)
+    diff_time = time.perf_counter() - started
+    names     = {s[0] for s in old_spans + new_spans}
+
+    if not (added or removed or moved):
+        return AnalysisResult(new_table, [], [], [], [], [], [], [], 0, len(new_spans), len(names), diff_time, 0.0)
+
+    started       = time.perf_counter()
+    parsed        = parse_diff(added, removed)
+    modifications = modification_records(parsed)
+    semantic      = []
+    # build_digest only shows semantic changes for files without parsed modifications
+    if not parsed.total() and task.friendly_name.endswith(".ini"):
+        semantic = semantic_changes(task.old_data, task.old_table, task.new_data, new_table, names)
+    parse_time    = time.perf_counter() - started
+
+    return AnalysisResult(
+        new_table, added, removed, moved, semantic, modifications, parsed.localized_plus, parsed.localized_minus,
+        parsed.total(), len(new_spans), len(names), diff_time, parse_time,
+    )
@@ -0,0 +1,316 @@
+import os
+import re
+import sys
+import glob
+import json
+import random
+import time
+import resource
+import tracemalloc
+
+from diff_engine import diff_lines, diff_lines_ordered
+from hotfix_parser import parse_diff
+from state_store import RESERVED_FILES, content_hash
+from streaming import CHUNK_SIZE, StreamingBody
+from section_index import section_table
+from analysis import AnalysisTask, analyze
+
+STATE_DIR = "state"
+
+
+def load_snapshots():
+    snapshots = {}
+    for path in sorted(glob.glob(os.path.join(STATE_DIR, "*.json"))):
+        if path.endswith("_parsed.json") or os.path.basename(path) in RESERVED_FILES:
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            snapshots[os.path.basename(path)[:-len(".json")]] = json.load(f)
+    return snapshots
+
+
+def mutate(lines, rng, rate=0.02):
+    out = list(lines)
+    n   = max(1, int(len(out) * rate))
+    for _ in range(n):
+        if not out:
+            break
+        i = rng.randrange(len(out))
+        op = rng.random()
+        if op < 0.4:
+            out[i] = out[i].rstrip("\n") + " ;mutated\n"
+        elif op < 0.7:
+            del out[i]
+        else:
+            out.insert(rng.randrange(len(out) + 1), out[i])
+    return out
+
+
+def _naive(old_lines, new_lines):
+    added   = [l for l in new_lines if l not in old_lines]
+    removed = [l for l in old_lines if l not in new_lines]
+    return added, removed
+
+
+def _timeit(fn, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_diff():
+    rng   = random.Random(1234)
+    pairs = [(name, lines, mutate(lines, rng)) for name, lines in load_snapshots().items()]
+    total = {"naive": 0.0, "multiset": 0.0, "ordered": 0.0}
+
+    print(f"{'file':<50} {'lines':>6} {'naive ms':>10} {'multiset ms':>12} {'ordered ms':>11}")
+    for name, old, new in pairs:
+        row = {
+            "naive":    _timeit(_naive, old, new),
+            "multiset": _timeit(diff_lines, old, new),
+            "ordered":  _timeit(diff_lines_ordered, old, new),
+        }
+        for k, v in row.items():
+            total[k] += v
+        if len(old) >= 50:
+            print(f"{name:<50} {len(old):>6} {row['naive']*1e3:>10.3f} {row['multiset']*1e3:>12.3f} {row['ordered']*1e3:>11.3f}")
+
+    print(f"{'TOTAL (' + str(len(pairs)) + ' files)':<50} {'':>6} {total['naive']*1e3:>10.3f} {total['multiset']*1e3:>12.3f} {total['ordered']*1e3:>11.3f}")
+
+
+# the pre-single-pass parser methods from the original main.py, minus their warning logs
+def _baseline_parse_hotfix_strings(lines):
+    pat = re.compile(
+        r'\+TextReplacements=.*?Key="(?P<k>[^"]+)".*?LocalizedStrings=\(\((?P<i>.+?)\)\)\)\n'
+    )
+    en = re.compile(r'\("en","(?P<t>[^"]+)"\)')
+    out = []
+    for l in lines:
+        m = pat.search(l)
+        if not m:
+            continue
+        inner = m.group("i")
+        m2 = en.search(inner)
+        if m2:
+            out.append((m.group("k"), m2.group("t")))
+    return out
+
+
+def _baseline_parse_datatable(lines, sign):
+    out = []
+    for l in lines:
+        if f"{sign}DataTable=" not in l:
+            continue
+        body = l.lstrip(f"{sign} ").rstrip()
+        try:
+            _, rest = body.split("=", 1)
+        except ValueError:
+            continue
+        parts = rest.split(";", 4)
+        if len(parts) == 5:
+            path, action, row, field, value = parts
+            out.append((path, row, field, value, sign))
+        elif len(parts) == 3:
+            path, action, inner = parts
+            if action == "AddRow":
+                try:
+                    inner_content = inner[1:-1] if (inner.startswith('"') and inner.endswith('"')) else inner
+                    data = json.loads(inner_content)
+                    row_name = data.get("Name", "")
+                    wrapped_str = data.get("WrappedString", "")
+                    out.append((path, row_name, "WrappedString", wrapped_str, sign))
+                except json.JSONDecodeError:
+                    pass
+            elif action == "TableUpdate":
+                try:
+                    inner_content = inner[1:-1] if (inner.startswith('"') and inner.endswith('"')) else inner
+                    data_list = json.loads(inner_content)
+                    for entry in data_list:
+                        name = entry.get("Name","")
+                        ti_obj = entry.get("TaskIdentifier",{})
+                        task_tag = ti_obj.get("TagName","") if isinstance(ti_obj,dict) else ""
+                        link = entry.get("LinkedQuestDefinition","")
+                        out.append((path,name,"TaskIdentifier.TagName",task_tag,sign))
+                        out.append((path,name,"LinkedQuestDefinition",link,sign))
+                except json.JSONDecodeError:
+                    pass
+    return out
+
+
+def _baseline_parse_curvetable(lines, sign):
+    out = []
+    for l in lines:
+        if f"{sign}CurveTable=" not in l:
+            continue
+        body = l.lstrip(f"{sign} ").rstrip()
+        try:
+            _, rest = body.split("=",1)
+        except ValueError:
+            continue
+        parts = rest.split(";",4)
+        if len(parts) < 5:
+            continue
+        path, action, identifier, input_val, new_val = parts
+        if "." not in identifier:
+            continue
+        row, field = identifier.rsplit(".",1)
+        out.append((path, row, field, new_val, sign))
+    return out
+
+
+def _baseline_parse(added, removed):
+    return (
+        _baseline_parse_datatable(added, "+"),
+        _baseline_parse_datatable(removed, "-"),
+        _baseline_parse_curvetable(added, "+"),
+        _baseline_parse_curvetable(removed, "-"),
+        _baseline_parse_hotfix_strings(added),
+    )
+
+
+def bench_parse():
+    snapshots = load_snapshots()
+    added     = snapshots["DefaultGame.ini"]
+    removed   = [("-" + l[1:]) if l.startswith("+") else l for l in added]
+
+    baseline = _baseline_parse(added, removed)
+    parsed   = parse_diff(added, removed, localized=False)
+    single   = tuple(list(map(tuple, records)) for records in parsed[:5])
+    counts   = f"{len(parsed.dt_plus)} DataTable, {len(parsed.ct_plus)} CurveTable, {len(parsed.strings)} String"
+    print(f"DefaultGame.ini: {len(added)} lines, {counts}")
+    for label, old, new in zip(("dt_plus", "dt_minus", "ct_plus", "ct_minus", "strings"), baseline, single):
+        if old != new:
+            print(f"warning: {label} differs from the baseline parser ({len(old)} vs {len(new)} records)")
+
+    t_base   = _timeit(_baseline_parse, added, removed, repeat=20)
+    t_single = _timeit(parse_diff, added, removed, False, repeat=20)
+    t_locale = _timeit(parse_diff, added, removed, repeat=20)
+    print(f"baseline five-pass: {t_base*1e3:.3f} ms   single-pass: {t_single*1e3:.3f} ms   speed-up: {t_base/t_single:.2f}x")
+    print(f"single-pass with every locale on both sides: {t_locale*1e3:.3f} ms")
+
+
+def _buffered_path(payload, old_digest, old_lines):
+    text      = payload.decode("utf-8")
+    new_bytes = text.encode("utf-8")
+    if content_hash(new_bytes) == old_digest:
+        return None
+    new_lines = text.splitlines(keepends=True)
+    return diff_lines(old_lines, new_lines)
+
+
+def _streaming_path(payload, old_digest, old_data, old_table):
+    body = StreamingBody()
+    for i in range(0, len(payload), CHUNK_SIZE):
+        body.feed(payload[i:i + CHUNK_SIZE])
+    if body.digest == old_digest:
+        return None
+    return analyze(AnalysisTask("bench.ini", old_data, body.data, old_table, "multiset"))
+
+
+def _peak(fn, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench_stream():
+    base       = load_snapshots()["DefaultGame.ini"]
+    old        = base * max(1, (8 * 1024 * 1024) // len("".join(base)))
+    new        = old[:-1] + ["+DataTable=/Game/Bench;RowUpdate;Row;Field;1\n"] + old[-1:]
+    old_data   = "".join(old).encode("utf-8")
+    old_digest = content_hash(old_data)
+    old_table  = section_table(old_data)
+    print(f"{len(old_data) / 1024 / 1024:.1f} MiB body, {len(old)} lines")
+    for label, payload in (("unchanged", old_data), ("1 line added", "".join(new).encode("utf-8"))):
+        # tracemalloc distorts timings, so time and peak memory are measured separately
+        buffered  = (_buffered_path, payload, old_digest, old)
+        streamed  = (_streaming_path, payload, old_digest, old_data, old_table)
+        t_buf, p_buf = _timeit(*buffered, repeat=3), _peak(*buffered)[1]
+        t_str, p_str = _timeit(*streamed, repeat=3), _peak(*streamed)[1]
+        print(f"{label}:")
+        print(f"  buffered text + full diff: {t_buf*1e3:8.1f} ms  peak {p_buf / 1024 / 1024:6.1f} MiB")
+        print(f"  streamed bytes + analyze:  {t_str*1e3:8.1f} ms  peak {p_str / 1024 / 1024:6.1f} MiB")
+    print(f"process peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+
+
+def _grep_state(query):
+    hits = []
+    for name, lines in load_snapshots().items():
+        hits.extend((name, l) for l in lines if query in l)
+    return hits
+
+
+def bench_search():
+    import tempfile
+    from text_index import TextIndex
+    from hotfix_parser import extract_strings
+
+    snapshots = load_snapshots()
+    with tempfile.TemporaryDirectory(prefix="bench-index-") as tmp:
+        index = TextIndex(os.path.join(tmp, "text_index.sqlite3"))
+        t0 = time.perf_counter()
+        for name, lines in snapshots.items():
+            index.rebuild(name, content_hash("".join(lines).encode("utf-8")), extract_strings(lines))
+        build = time.perf_counter() - t0
+
+        rng    = random.Random(1234)
+        name   = "DefaultGame.ini"
+        old    = snapshots[name]
+        new    = mutate(old, rng, 0.2)
+        added, removed = diff_lines(old, new)
+        t0 = time.perf_counter()
+        index.update(name, "mutated", extract_strings(added), extract_strings(removed))
+        incremental = time.perf_counter() - t0
+        if sorted(index.live(name)) != sorted(map(tuple, extract_strings(new))):
+            print("warning: incremental update diverged from a full extraction")
+
+        live    = [s for lines in snapshots.values() for s in extract_strings(lines)]
+        queries = [" ".join(s.text.split()[:2]) for s in rng.sample(live, min(200, len(live)))]
+        timings = []
+        for q in queries:
+            t0 = time.perf_counter()
+            index.search(q)
+            timings.append(time.perf_counter() - t0)
+        timings.sort()
+        t_grep = _timeit(_grep_state, queries[0], repeat=3)
+        index.close()
+
+    print(f"{len(live)} localized strings across {len(snapshots)} files, built in {build*1e3:.1f} ms")
+    print(f"incremental update ({len(added)} added/{len(removed)} removed lines): {incremental*1e3:.3f} ms")
+    print(f"search: {len(queries)} queries   avg: {sum(timings)/len(timings)*1e3:.3f} ms   "
+          f"p95: {timings[int(len(timings)*0.95)]*1e3:.3f} ms   grep over state: {t_grep*1e3:.1f} ms")
+
+
+def bench_replay():
+    import asyncio
+    from replay import replay
+    asyncio.run(replay())
+
+
+def bench_restart():
+    import asyncio
+    from replay import restart
+    asyncio.run(restart())
+
+
+BENCHMARKS = {
+    "diff":    bench_diff,
+    "parse":   bench_parse,
+    "stream":  bench_stream,
+    "search":  bench_search,
+    "replay":  bench_replay,
+    "restart": bench_restart,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
@@ -0,0 +1,36 @@
+import json
+import time
+import logging
+
+from state_store import atomic_write
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path, listing, tokens, digests):
+    data = {
+        "version":  CHECKPOINT_VERSION,
+        "saved_at": time.time(),
+        "listing":  listing,
+        "tokens":   tokens,
+        "digests":  digests,
+    }
+    atomic_write(path, json.dumps(data, separators=(",", ":")).encode("utf-8"), mode=0o600)
+
+
+def load_checkpoint(path, max_age):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        logging.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+        return None
+    if data.get("version") != CHECKPOINT_VERSION:
+        return None
+    age = time.time() - data.get("saved_at", 0)
+    if age > max_age:
+        logging.info(f"Checkpoint is {age / 3600:.1f}h old — ignoring cached listing.")
+        data["listing"] = None
+    return data
@@ -0,0 +1,142 @@
+import difflib
+from bisect import bisect_left
+from collections import Counter
+
+
+def diff_lines(old_lines, new_lines):
+    remaining = Counter(old_lines)
+    added = []
+    for l in new_lines:
+        if remaining[l] > 0:
+            remaining[l] -= 1
+        else:
+            added.append(l)
+
+    remaining = Counter(new_lines)
+    removed = []
+    for l in old_lines:
+        if remaining[l] > 0:
+            remaining[l] -= 1
+        else:
+            removed.append(l)
+
+    return added, removed
+
+
+def _unique_anchors(a, alo, ahi, b, blo, bhi):
+    a_counts = Counter(a[alo:ahi])
+    b_counts = Counter(b[blo:bhi])
+    b_index  = {}
+    for j in range(blo, bhi):
+        l = b[j]
+        if a_counts[l] == 1 and b_counts[l] == 1:
+            b_index[l] = j
+
+    pairs = [(i, b_index[a[i]]) for i in range(alo, ahi) if a[i] in b_index]
+    if not pairs:
+        return []
+
+    # patience sorting: longest increasing run of b-indices over a-order
+    tails, tail_idx, prev = [], [], [None] * len(pairs)
+    for n, (_, j) in enumerate(pairs):
+        pos = bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tail_idx.append(n)
+        else:
+            tails[pos]    = j
+            tail_idx[pos] = n
+        prev[n] = tail_idx[pos - 1] if pos else None
+
+    anchors = []
+    n = tail_idx[-1]
+    while n is not None:
+        anchors.append(pairs[n])
+        n = prev[n]
+    anchors.reverse()
+    return anchors
+
+
+def _patience_ops(a, b):
+    deletes, inserts = [], []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+
+        if alo == ahi:
+            inserts.extend(range(blo, bhi))
+            continue
+        if blo == bhi:
+            deletes.extend(range(alo, ahi))
+            continue
+
+        anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+        if not anchors:
+            sm = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+            for tag, i1, i2, j1, j2 in sm.get_opcodes():
+                if tag in ("delete", "replace"):
+                    deletes.extend(range(alo + i1, alo + i2))
+                if tag in ("insert", "replace"):
+                    inserts.extend(range(blo + j1, blo + j2))
+            continue
+
+        i, j = alo, blo
+        for ai, bj in anchors:
+            stack.append((i, ai, j, bj))
+            i, j = ai + 1, bj + 1
+        stack.append((i, ahi, j, bhi))
+
+    deletes.sort()
+    inserts.sort()
+    return deletes, inserts
+
+
+def edit_script(old_lines, new_lines):
+    deletes, inserts = _patience_ops(old_lines, new_lines)
+    return deletes, [(j, new_lines[j]) for j in inserts]
+
+
+def apply_edit_script(old_lines, deletes, inserts):
+    deleted = set(deletes)
+    kept    = (l for i, l in enumerate(old_lines) if i not in deleted)
+    out     = []
+    for j, line in inserts:
+        while len(out) < j:
+            out.append(next(kept))
+        out.append(line)
+    out.extend(kept)
+    return out
+
+
+def diff_lines_ordered(old_lines, new_lines):
+    deletes, inserts = _patience_ops(old_lines, new_lines)
+
+    moved_counts = Counter(old_lines[i] for i in deletes) & Counter(new_lines[j] for j in inserts)
+    moved = list(moved_counts.elements())
+
+    left    = moved_counts.copy()
+    removed = []
+    for i in deletes:
+        l = old_lines[i]
+        if left[l] > 0:
+            left[l] -= 1
+        else:
+            removed.append(l)
+
+    left  = moved_counts.copy()
+    added = []
+    for j in inserts:
+        l = new_lines[j]
+        if left[l] > 0:
+            left[l] -= 1
+        else:
+            added.append(l)
+
+    return added, removed, moved
@@ -0,0 +1,99 @@
+import json
+
+from embed_packer import FieldGroup, pack_groups, clip
+
+CONTENT_LIMIT = 2000
+FILES_SHOWN   = 6
+
+
+class FileUpdate:
+    __slots__ = ("friendly_name", "modifications", "diff_payload", "digest", "old_digest")
+
+    def __init__(self, friendly_name, modifications, diff_payload, digest=None, old_digest=None):
+        self.friendly_name = friendly_name
+        self.modifications = modifications
+        self.diff_payload  = diff_payload
+        self.digest        = digest
+        self.old_digest    = old_digest
+
+
+def mod_signature(m):
+    return (
+        m["type"], m.get("path", ""), m.get("row_name", ""), m.get("field", ""),
+        m.get("key", ""), m.get("new_value", m.get("value", "")), m.get("change", "Added"),
+    )
+
+
+def coalesce(updates):
+    merged = {}
+    for update in updates:
+        for m in update.modifications:
+            files = merged.setdefault(mod_signature(m), [])
+            if update.friendly_name not in files:
+                files.append(update.friendly_name)
+    return merged
+
+
+def files_label(files):
+    if len(files) > FILES_SHOWN:
+        return ", ".join(files[:FILES_SHOWN - 1]) + f" +{len(files) - FILES_SHOWN + 1} more"
+    return ", ".join(files)
+
+
+def digest_groups(merged):
+    groups = {}
+    order  = []
+    for (kind, path, row, field, key, value, change), files in merged.items():
+        if kind == "String":
+            group_key   = ("String",)
+            description = "➥ **String modification detected**"
+            name, text  = f"**{key}**", f"➥ {value}"
+        elif kind == "DataTable":
+            group_key   = ("DataTable", path)
+            description = f"➥ **DataTable Modification:** ```{path}```"
+            name, text  = f"`{row} → {field}`", value
+        else:
+            group_key   = ("CurveTable", path)
+            description = f"```{path}```"
+            name, text  = f"`{row}.{field}`", value
+
+        if group_key not in groups:
+            groups[group_key] = FieldGroup(description)
+            order.append(group_key)
+        suffix = f"\n*{files_label(files)}*"
+        groups[group_key].add(name, clip(text, 1024 - len(suffix)) + suffix)
+    return [groups[k] for k in order]
+
+
+def build_digest(updates, removed, ping):
+    updated = [u.friendly_name for u in updates]
+    parts   = []
+    if updated:
+        parts.append(f"{len(updated)} updated: {', '.join(updated)}")
+    if removed:
+        parts.append(f"{len(removed)} removed: {', '.join(removed)}")
+    if not parts:
+        return []
+    content = clip(f"{ping} " + "; ".join(parts), CONTENT_LIMIT)
+
+    merged   = coalesce(updates)
+    messages = [{"content": None, "embeds": chunk} for chunk in pack_groups(digest_groups(merged))]
+    if not messages:
+        messages = [{"content": None}]
+    messages[0]["content"] = content
+
+    attachments = []
+    sections    = [
+        {"section_name": u.friendly_name, "modifications": u.modifications}
+        for u in updates if u.modifications
+    ]
+    if sections:
+        data = json.dumps(sections, indent=4, ensure_ascii=False).encode("utf-8")
+        attachments.append(("cycle_parsed.json", data))
+    raw = {u.friendly_name: u.diff_payload for u in updates if not u.modifications}
+    if raw:
+        attachments.append(("cycle_diff.json", json.dumps(raw, indent=2).encode("utf-8")))
+    if attachments:
+        messages[-1]["attachments"] = attachments
+
+    return messages
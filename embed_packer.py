@@ -0,0 +1,62 @@
+MESSAGE_CHAR_LIMIT  = 6000
+MESSAGE_EMBED_LIMIT = 10
+EMBED_FIELD_LIMIT   = 25
+TITLE_LIMIT         = 256
+DESCRIPTION_LIMIT   = 4096
+FIELD_NAME_LIMIT    = 256
+FIELD_VALUE_LIMIT   = 1024
+
+EMPTY = "\u200b"
+
+
+def clip(text, limit):
+    text = str(text)
+    if not text:
+        return EMPTY
+    if len(text) <= limit:
+        return text
+    return text[:limit - 1] + "…"
+
+
+class FieldGroup:
+    __slots__ = ("description", "fields")
+
+    def __init__(self, description, fields=None):
+        self.description = description
+        self.fields      = fields if fields is not None else []
+
+    def add(self, name, value):
+        self.fields.append((name, value))
+
+
+def embed_size(embed):
+    return len(embed["title"]) + len(embed["description"]) + sum(len(n) + len(v) for n, v in embed["fields"])
+
+
+def pack_groups(groups, title="Summary"):
+    title    = clip(title, TITLE_LIMIT)
+    messages = []
+    current  = []
+    size     = 0
+
+    for group in groups:
+        description = clip(group.description, DESCRIPTION_LIMIT)
+        head        = len(title) + len(description)
+        embed       = None
+        for name, value in group.fields:
+            name  = clip(name, FIELD_NAME_LIMIT)
+            value = clip(value, FIELD_VALUE_LIMIT)
+            cost  = len(name) + len(value)
+            if embed is None or len(embed["fields"]) >= EMBED_FIELD_LIMIT or size + cost > MESSAGE_CHAR_LIMIT:
+                if len(current) >= MESSAGE_EMBED_LIMIT or size + head + cost > MESSAGE_CHAR_LIMIT:
+                    messages.append(current)
+                    current, size = [], 0
+                embed = {"title": title, "description": description, "fields": []}
+                current.append(embed)
+                size += head
+            embed["fields"].append((name, value))
+            size += cost
+
+    if current:
+        messages.append(current)
+    return messages
@@ -0,0 +1,188 @@
+import os
+import sys
+import json
+import zlib
+import sqlite3
+from datetime import datetime, timezone
+
+from diff_engine import edit_script, apply_edit_script
+
+KEYFRAME_INTERVAL = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id              INTEGER PRIMARY KEY,
+    name            TEXT NOT NULL UNIQUE,
+    unique_filename TEXT
+);
+CREATE TABLE IF NOT EXISTS versions (
+    id         INTEGER PRIMARY KEY,
+    file_id    INTEGER NOT NULL REFERENCES files(id),
+    seen_at    TEXT NOT NULL,
+    sha256     TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    line_count INTEGER NOT NULL,
+    keyframe   INTEGER NOT NULL,
+    payload    BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS modifications (
+    id         INTEGER PRIMARY KEY,
+    version_id INTEGER NOT NULL REFERENCES versions(id),
+    file_id    INTEGER NOT NULL REFERENCES files(id),
+    type       TEXT NOT NULL,
+    path       TEXT,
+    row_name   TEXT,
+    field      TEXT,
+    key        TEXT,
+    value      TEXT,
+    change     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_versions_file ON versions(file_id, id);
+CREATE INDEX IF NOT EXISTS idx_versions_sha  ON versions(sha256);
+CREATE INDEX IF NOT EXISTS idx_mods_file     ON modifications(file_id, version_id);
+CREATE INDEX IF NOT EXISTS idx_mods_path     ON modifications(path, version_id);
+CREATE INDEX IF NOT EXISTS idx_mods_row      ON modifications(row_name, version_id);
+CREATE INDEX IF NOT EXISTS idx_mods_key      ON modifications(key, version_id);
+"""
+
+
+def _pack(obj):
+    return zlib.compress(json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def _unpack(blob):
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class HistoryStore:
+    def __init__(self, path):
+        self.path = path
+        self.db   = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("PRAGMA foreign_keys=ON")
+        self.db.executescript(SCHEMA)
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    def _file_id(self, name, unique_filename=None):
+        row = self.db.execute("SELECT id FROM files WHERE name = ?", (name,)).fetchone()
+        if row:
+            if unique_filename:
+                self.db.execute("UPDATE files SET unique_filename = ? WHERE id = ?", (unique_filename, row["id"]))
+            return row["id"]
+        cur = self.db.execute("INSERT INTO files (name, unique_filename) VALUES (?, ?)", (name, unique_filename))
+        return cur.lastrowid
+
+    def _latest(self, file_id):
+        return self.db.execute(
+            "SELECT id, sha256 FROM versions WHERE file_id = ? ORDER BY id DESC LIMIT 1", (file_id,)
+        ).fetchone()
+
+    def _since_keyframe(self, file_id):
+        row = self.db.execute(
+            "SELECT COUNT(*) FROM versions WHERE file_id = ? AND id > "
+            "COALESCE((SELECT MAX(id) FROM versions WHERE file_id = ? AND keyframe = 1), 0)",
+            (file_id, file_id),
+        ).fetchone()
+        return row[0]
+
+    def record_version(self, name, sha256, new_lines, old_lines=None, old_sha256=None,
+                       modifications=(), unique_filename=None, seen_at=None):
+        seen_at = seen_at or datetime.now(timezone.utc).isoformat()
+        with self.db:
+            file_id = self._file_id(name, unique_filename)
+            latest  = self._latest(file_id)
+            if latest and latest["sha256"] == sha256:
+                return latest["id"]
+
+            use_delta = (
+                latest is not None
+                and old_lines is not None
+                and latest["sha256"] == old_sha256
+                and self._since_keyframe(file_id) < KEYFRAME_INTERVAL - 1
+            )
+            if use_delta:
+                deletes, inserts = edit_script(old_lines, new_lines)
+                payload = _pack({"d": deletes, "i": inserts})
+            else:
+                payload = _pack(new_lines)
+
+            cur = self.db.execute(
+                "INSERT INTO versions (file_id, seen_at, sha256, size, line_count, keyframe, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (file_id, seen_at, sha256, sum(len(l.encode("utf-8")) for l in new_lines),
+                 len(new_lines), 0 if use_delta else 1, payload),
+            )
+            version_id = cur.lastrowid
+
+            self.db.executemany(
+                "INSERT INTO modifications (version_id, file_id, type, path, row_name, field, key, value, change) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (version_id, file_id, m["type"], m.get("path"), m.get("row_name"), m.get("field"),
+                     m.get("key"), m.get("new_value", m.get("value")), m.get("change", "Added"))
+                    for m in modifications
+                ],
+            )
+        return version_id
+
+    def content_at(self, version_id):
+        target = self.db.execute("SELECT file_id FROM versions WHERE id = ?", (version_id,)).fetchone()
+        if target is None:
+            return None
+        base = self.db.execute(
+            "SELECT id, payload FROM versions WHERE file_id = ? AND keyframe = 1 AND id <= ? "
+            "ORDER BY id DESC LIMIT 1",
+            (target["file_id"], version_id),
+        ).fetchone()
+        lines = _unpack(base["payload"])
+        for row in self.db.execute(
+            "SELECT payload FROM versions WHERE file_id = ? AND id > ? AND id <= ? ORDER BY id",
+            (target["file_id"], base["id"], version_id),
+        ):
+            delta = _unpack(row["payload"])
+            lines = apply_edit_script(lines, delta["d"], delta["i"])
+        return lines
+
+    def versions(self, name, limit=20):
+        return [dict(r) for r in self.db.execute(
+            "SELECT v.id, v.seen_at, v.sha256, v.size, v.line_count, v.keyframe "
+            "FROM versions v JOIN files f ON f.id = v.file_id WHERE f.name = ? "
+            "ORDER BY v.id DESC LIMIT ?",
+            (name, limit),
+        )]
+
+    def last_change(self, path=None, row_name=None, key=None, file=None):
+        clauses, params = [], []
+        for column, value in (("m.path", path), ("m.row_name", row_name), ("m.key", key), ("f.name", file)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if not clauses:
+            raise ValueError("last_change needs at least one of path, row_name, key or file")
+        row = self.db.execute(
+            "SELECT f.name AS file, v.seen_at, v.id AS version_id, m.type, m.path, m.row_name, "
+            "m.field, m.key, m.value, m.change "
+            "FROM modifications m JOIN versions v ON v.id = m.version_id JOIN files f ON f.id = m.file_id "
+            f"WHERE {' AND '.join(clauses)} ORDER BY m.version_id DESC LIMIT 1",
+            params,
+        ).fetchone()
+        return dict(row) if row else None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("path", "row", "key", "file", "versions"):
+        print("usage: history_store.py {path|row|key|file|versions} <value> [db]")
+        sys.exit(1)
+    kind, value = sys.argv[1], sys.argv[2]
+    db_path     = sys.argv[3] if len(sys.argv) > 3 else os.path.join("state", "history.sqlite3")
+    store       = HistoryStore(db_path)
+    if kind == "versions":
+        result = store.versions(value)
+    else:
+        result = store.last_change(**{{"row": "row_name"}.get(kind, kind): value})
+    print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -0,0 +1,163 @@
+import re
+import json
+import logging
+from typing import NamedTuple
+
+TEXT_KEY_RE         = re.compile(r'Key="([^"]+)"')
+LOCALIZED_OPEN      = "LocalizedStrings=(("
+EN_STRING_RE        = re.compile(r'\("en","(?P<t>[^"]+)"\)')
+LOCALIZED_STRING_RE = re.compile(r'\("(?P<l>[^"]+)","(?P<t>[^"\\]*(?:\\.[^"\\]*)*)"\)')
+NATIVE_STRING_RE    = re.compile(r'NativeString="(?P<t>[^"\\]*(?:\\.[^"\\]*)*)"')
+ESCAPE_RE           = re.compile(r'\\(["\\])')
+
+
+class TableMod(NamedTuple):
+    path:  str
+    row:   str
+    field: str
+    value: str
+    sign:  str
+
+
+class StringMod(NamedTuple):
+    key:  str
+    text: str
+
+
+class LocalizedString(NamedTuple):
+    key:    str
+    locale: str
+    text:   str
+
+
+class ParsedDiff(NamedTuple):
+    dt_plus:         list
+    dt_minus:        list
+    ct_plus:         list
+    ct_minus:        list
+    strings:         list
+    localized_plus:  list
+    localized_minus: list
+
+    def total(self):
+        return len(self.dt_plus) + len(self.dt_minus) + len(self.ct_plus) + len(self.ct_minus) + len(self.strings)
+
+
+def _unquote(inner):
+    return inner[1:-1] if (inner.startswith('"') and inner.endswith('"')) else inner
+
+
+def parse_datatable_line(line, sign, out):
+    body = line.lstrip(f"{sign} ").rstrip()
+    try:
+        _, rest = body.split("=", 1)
+    except ValueError:
+        return
+    parts = rest.split(";", 4)
+    if len(parts) == 5:
+        path, action, row, field, value = parts
+        out.append(TableMod(path, row, field, value, sign))
+    elif len(parts) == 3:
+        path, action, inner = parts
+        if action == "AddRow":
+            try:
+                data = json.loads(_unquote(inner))
+                out.append(TableMod(path, data.get("Name", ""), "WrappedString", data.get("WrappedString", ""), sign))
+            except json.JSONDecodeError:
+                logging.warning(f"[parse_datatable] JSON‐decode failed: {inner}")
+        elif action == "TableUpdate":
+            try:
+                for entry in json.loads(_unquote(inner)):
+                    name     = entry.get("Name", "")
+                    ti_obj   = entry.get("TaskIdentifier", {})
+                    task_tag = ti_obj.get("TagName", "") if isinstance(ti_obj, dict) else ""
+                    link     = entry.get("LinkedQuestDefinition", "")
+                    out.append(TableMod(path, name, "TaskIdentifier.TagName", task_tag, sign))
+                    out.append(TableMod(path, name, "LinkedQuestDefinition", link, sign))
+            except json.JSONDecodeError:
+                logging.warning(f"[parse_datatable] JSON‐decode failed: {inner}")
+
+
+def parse_curvetable_line(line, sign, out):
+    body = line.lstrip(f"{sign} ").rstrip()
+    try:
+        _, rest = body.split("=", 1)
+    except ValueError:
+        return
+    parts = rest.split(";", 4)
+    if len(parts) < 5:
+        return
+    path, action, identifier, input_val, new_val = parts
+    if "." not in identifier:
+        return
+    row, field = identifier.rsplit(".", 1)
+    out.append(TableMod(path, row, field, new_val, sign))
+
+
+def split_text_replacement(line):
+    # string find/endswith instead of one lazy regex over the whole line, which dominated parse time
+    body = line.rstrip()
+    if not body.endswith(")))"):
+        return None
+    start = body.find(LOCALIZED_OPEN)
+    if start == -1:
+        return None
+    key = TEXT_KEY_RE.search(body, 0, start)
+    if not key:
+        return None
+    return key.group(1), body[:start], body[start + len(LOCALIZED_OPEN):-3]
+
+
+def parse_string_line(line, strings, localized):
+    parts = split_text_replacement(line)
+    if not parts:
+        return
+    key, head, inner = parts
+    if strings is not None:
+        m = EN_STRING_RE.search(inner)
+        if m:
+            strings.append(StringMod(key, m.group("t")))
+    if localized is not None:
+        localized_strings(key, head, inner, localized)
+
+
+def _unescape(text):
+    return ESCAPE_RE.sub(r"\1", text) if "\\" in text else text
+
+
+def localized_strings(key, head, inner, out):
+    native = NATIVE_STRING_RE.search(head)
+    if native:
+        out.append(LocalizedString(key, "native", _unescape(native.group("t"))))
+    # inner lacks the outer parens of the first and last pair
+    for locale, text in LOCALIZED_STRING_RE.findall(f"({inner})"):
+        out.append(LocalizedString(key, locale, _unescape(text)))
+
+
+def extract_strings(lines):
+    out = []
+    for l in lines:
+        if l.lstrip().startswith("+TextReplacements="):
+            parse_string_line(l, None, out)
+    return out
+
+
+def _dispatch(lines, sign, datatables, curvetables, strings, localized):
+    dt_prefix = f"{sign}DataTable="
+    ct_prefix = f"{sign}CurveTable="
+    tr_prefix = "+TextReplacements=" if strings is not None or localized is not None else None
+    for l in lines:
+        head = l.lstrip()
+        if head.startswith(dt_prefix):
+            parse_datatable_line(head, sign, datatables)
+        elif head.startswith(ct_prefix):
+            parse_curvetable_line(head, sign, curvetables)
+        elif tr_prefix and head.startswith(tr_prefix):
+            parse_string_line(l, strings, localized)
+
+
+def parse_diff(added, removed, localized=True):
+    parsed = ParsedDiff([], [], [], [], [], [], [])
+    _dispatch(added, "+", parsed.dt_plus, parsed.ct_plus, parsed.strings, parsed.localized_plus if localized else None)
+    _dispatch(removed, "-", parsed.dt_minus, parsed.ct_minus, None, parsed.localized_minus if localized else None)
+    return parsed
@@ -0,0 +1,29 @@
+import json
+
+LISTING_FIELDS = ("hash256", "hash", "length", "uploaded")
+
+
+def parse_listing(text):
+    listing = {}
+    for entry in json.loads(text):
+        ufn   = entry.get("uniqueFilename")
+        fname = entry.get("filename")
+        if ufn and fname:
+            listing[ufn] = entry
+    return listing
+
+
+def listing_fingerprint(entry):
+    return tuple(entry.get(k) for k in LISTING_FIELDS)
+
+
+def diff_listing(old, new, unchanged=None):
+    if unchanged is None:
+        unchanged = lambda ufn, entry: (
+            ufn in old and listing_fingerprint(old[ufn]) == listing_fingerprint(entry)
+        )
+
+    added   = [ufn for ufn in new if ufn not in old]
+    removed = [ufn for ufn in old if ufn not in new]
+    changed = [ufn for ufn, entry in new.items() if ufn in old and not unchanged(ufn, entry)]
+    return added, removed, changed
@@ -0,0 +1,67 @@
+from collections import Counter
+
+OPERATORS = "+-.!"
+
+
+def parse_entry(line):
+    text = line.strip()
+    if not text or text[0] in ";#[":
+        return None
+    op = ""
+    if text[0] in OPERATORS:
+        op, text = text[0], text[1:]
+    if "=" not in text:
+        return None
+    key, value = text.split("=", 1)
+    return op, key.strip(), value.strip()
+
+
+class Section:
+    __slots__ = ("name", "ops")
+
+    def __init__(self, name, lines):
+        self.name = name
+        self.ops  = [e for e in map(parse_entry, lines[1:] if name else lines) if e]
+
+
+def resolve(ops):
+    # each key maps to {value: count} in insertion order, so AddUnique is a lookup rather than a list scan
+    values = {}
+    for op, key, value in ops:
+        if op == "":
+            values[key] = {value: 1}
+        elif op == "!":
+            values[key] = {}
+        else:
+            current = values.setdefault(key, {})
+            if op == "+":
+                current.setdefault(value, 1)
+            elif op == ".":
+                current[value] = current.get(value, 0) + 1
+            elif current.get(value):
+                current[value] -= 1
+                if not current[value]:
+                    del current[value]
+    return values
+
+
+def resolve_sections(spans):
+    ops = {}
+    for name, _, load in spans:
+        ops.setdefault(name, []).extend(Section(name, load()).ops)
+    return {name: resolve(section_ops) for name, section_ops in ops.items()}
+
+
+def semantic_diff(old_sections, new_sections, names=None):
+    changes = []
+    for name in names if names is not None else sorted(set(old_sections) | set(new_sections)):
+        old_keys = old_sections.get(name, {})
+        new_keys = new_sections.get(name, {})
+        for key in sorted(set(old_keys) | set(new_keys)):
+            old_vals = Counter(old_keys.get(key, {}))
+            new_vals = Counter(new_keys.get(key, {}))
+            for value in (new_vals - old_vals).elements():
+                changes.append({"section": name, "key": key, "change": "Added", "value": value})
+            for value in (old_vals - new_vals).elements():
+                changes.append({"section": name, "key": key, "change": "Removed", "value": value})
+    return changes
@@ -0,0 +1,39 @@
+import time
+import asyncio
+import logging
+
+
+class LoopLagMonitor:
+    def __init__(self, interval=0.25, threshold=0.1, histogram=None):
+        self.interval  = interval
+        self.threshold = threshold
+        self.histogram = histogram
+        self.task      = None
+        self.stats     = {"samples": 0, "stalls": 0, "max_lag": 0.0, "total_lag": 0.0}
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+
+    async def run(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - started - self.interval)
+            self.stats["samples"]   += 1
+            self.stats["total_lag"] += lag
+            self.stats["max_lag"]    = max(self.stats["max_lag"], lag)
+            if self.histogram is not None:
+                self.histogram.observe(lag)
+            if lag >= self.threshold:
+                self.stats["stalls"] += 1
+                logging.warning(f"Event loop blocked for {lag * 1000:.0f}ms")
+
+    def summary(self):
+        s   = self.stats
+        avg = s["total_lag"] / s["samples"] if s["samples"] else 0.0
+        return f"avg {avg * 1000:.1f}ms, max {s['max_lag'] * 1000:.0f}ms, {s['stalls']} stalls over {self.threshold * 1000:.0f}ms"
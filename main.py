@@ -1,16 +1,37 @@
 import os
 import io
 import json
-import math
+import time
 import asyncio
 import aiohttp
+import multiprocessing
 import discord
 from discord import File, Embed
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
-import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
 import logging
 
+from index_diff import LISTING_FIELDS, parse_listing, diff_listing
+from state_store import StateStore
+from snapshot_cache import SnapshotCache
+from history_store import HistoryStore
+from publisher import Publisher, PublishJob
+from digest import FileUpdate, build_digest
+from token_manager import TokenManager
+from resilience import Resilience, CircuitOpenError
+from scheduler import PollScheduler
+from metrics import Registry, serve as serve_metrics
+from streaming import CHUNK_SIZE, StreamingBody
+from section_index import section_table
+from analysis import AnalysisTask, analyze, file_strings
+from loop_monitor import LoopLagMonitor
+from persistence import Persistence, write_json
+from checkpoint import save_checkpoint, load_checkpoint
+from publish_journal import PublishJournal
+from text_index import TextIndex
+
 load_dotenv()
 
 logging.basicConfig(
@@ -24,323 +45,714 @@ ACCOUNT_ID     = os.getenv("EPIC_ACCOUNT_ID")
 CLIENT_SECRET  = os.getenv("EPIC_CLIENT_SECRET")
 PING_ROLE_ID   = int(os.getenv("PING_ROLE_ID", ""))
 
-TOKEN_URL      = "https://account-public-service-prod.ol.epicgames.com/account/api/oauth/token"
-SYSTEM_API_URL = "https://fngw-mcp-gc-livefn.ol.epicgames.com/fortnite/api/cloudstorage/system"
+TOKEN_URL      = os.getenv("TOKEN_URL", "https://account-public-service-prod.ol.epicgames.com/account/api/oauth/token")
+SYSTEM_API_URL = os.getenv("SYSTEM_API_URL", "https://fngw-mcp-gc-livefn.ol.epicgames.com/fortnite/api/cloudstorage/system")
 
 DISCORD_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
 CHANNEL_ID    = int(os.getenv("DISCORD_CHANNEL_ID", ""))
 POLL_INTERVAL = int(os.getenv("POLL_INTERVAL", "60"))
-STATE_DIR     = "state"
+POLL_MIN_INTERVAL = float(os.getenv("POLL_MIN_INTERVAL", "15"))
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", "900"))
+BURST_WINDOW      = float(os.getenv("BURST_WINDOW", "300"))
+LISTING_KEY       = "listing"
+DIFF_MODE     = os.getenv("DIFF_MODE", "multiset")
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "8"))
+FETCH_TIMEOUT     = float(os.getenv("FETCH_TIMEOUT", "20"))
+HTTP_KEEPALIVE    = float(os.getenv("HTTP_KEEPALIVE", "75"))
+DNS_CACHE_TTL     = int(os.getenv("DNS_CACHE_TTL", "300"))
+TOKEN_REFRESH_MARGIN = float(os.getenv("TOKEN_REFRESH_MARGIN", "120"))
+FETCH_RETRIES     = int(os.getenv("FETCH_RETRIES", "3"))
+BREAKER_THRESHOLD = int(os.getenv("BREAKER_THRESHOLD", "5"))
+BREAKER_RESET     = float(os.getenv("BREAKER_RESET", "300"))
+STATE_DIR     = os.getenv("STATE_DIR", "state")
 os.makedirs(STATE_DIR, exist_ok=True)
+VALIDATORS_FILE = os.path.join(STATE_DIR, "validators.json")
+CHECKPOINT_FILE = os.path.join(STATE_DIR, "checkpoint.json")
+CHECKPOINT_MAX_AGE = float(os.getenv("CHECKPOINT_MAX_AGE", str(6 * 60 * 60)))
+STATE_COMPRESSION = os.getenv("STATE_COMPRESSION", "gzip")
+SNAPSHOT_CACHE_MB = float(os.getenv("SNAPSHOT_CACHE_MB", "64"))
+PUBLISH_QUEUE_SIZE = int(os.getenv("PUBLISH_QUEUE_SIZE", "100"))
+DISCORD_RATE_LIMIT = int(os.getenv("DISCORD_RATE_LIMIT", "5"))
+DISCORD_RATE_PER   = float(os.getenv("DISCORD_RATE_PER", "5"))
+PUBLISH_JOURNAL    = os.getenv("PUBLISH_JOURNAL", os.path.join(STATE_DIR, "journal.sqlite3"))
+PUBLISH_MAX_ATTEMPTS = int(os.getenv("PUBLISH_MAX_ATTEMPTS", "5"))
+PUBLISH_RETRY_BASE = float(os.getenv("PUBLISH_RETRY_BASE", "60"))
+PUBLISH_RETRY_MAX  = float(os.getenv("PUBLISH_RETRY_MAX", "3600"))
+HISTORY_DB        = os.getenv("HISTORY_DB", os.path.join(STATE_DIR, "history.sqlite3"))
+TEXT_INDEX_DB     = os.getenv("TEXT_INDEX_DB", os.path.join(STATE_DIR, "text_index.sqlite3"))
+METRICS_HOST      = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT      = int(os.getenv("METRICS_PORT", "9108"))
+ANALYSIS_EXECUTOR = os.getenv("ANALYSIS_EXECUTOR", "process")
+ANALYSIS_WORKERS  = int(os.getenv("ANALYSIS_WORKERS", str(min(4, os.cpu_count() or 1))))
+LOOP_LAG_WARN     = float(os.getenv("LOOP_LAG_WARN", "0.1"))
 
 
 class FortniteTrackerBot(discord.Client):
     def __init__(self):
         super().__init__(intents=discord.Intents.default())
-        self.access_token     = None
-        self.refresh_token    = None
-        self.token_expires_at = datetime.utcnow()
+        self.started_at       = time.monotonic()
+        self.first_poll       = None
+        self.warm_start       = False
+        self.poll_task        = None
+        self.tokens           = None
+        self.metrics          = Registry("tracker_")
+        self.metrics_runner   = None
+        self.scheduler        = PollScheduler(burst_window=BURST_WINDOW)
+        self.resilience       = Resilience(
+            max_retries=FETCH_RETRIES, failure_threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET
+        )
         self.filename_map     = {}
         self.endpoints        = []
+        self.session          = None
+        self.conn_stats       = {"created": 0, "reused": 0}
+        self.listing          = {}
+        self.validators       = {}
+        self.validators_dirty = False
+        self.store            = StateStore(STATE_DIR, STATE_COMPRESSION)
+        self.persist          = Persistence(self.store)
+        self.snapshots        = SnapshotCache(int(SNAPSHOT_CACHE_MB * 1024 * 1024))
+        self.history          = HistoryStore(HISTORY_DB)
+        self.journal          = PublishJournal(PUBLISH_JOURNAL)
+        self.text_index       = TextIndex(TEXT_INDEX_DB)
+        self.journal_jobs     = set()
+        self.section_tables   = {}
+        self.cycle_files      = None
+        self.checkpoint_state = None
+        self.checkpoint_at    = 0.0
+        self.publisher        = None
+        self.publisher_task   = None
+        self.pool             = None
+        if os.path.isfile(VALIDATORS_FILE):
+            with open(VALIDATORS_FILE, "r", encoding="utf-8") as f:
+                self.validators = json.load(f)
+
+        self.fetch_seconds   = self.metrics.histogram("fetch_seconds", "Cloud storage GET latency per endpoint")
+        self.diff_seconds    = self.metrics.histogram("diff_seconds", "Line diff time per changed file")
+        self.parse_seconds   = self.metrics.histogram("parse_seconds", "Hotfix parse time per changed file")
+        self.digest_seconds  = self.metrics.histogram("digest_seconds", "Cycle digest and embed build time")
+        self.cycle_seconds   = self.metrics.histogram("poll_cycle_seconds", "Wall time of one poll cycle")
+        self.loop_monitor    = LoopLagMonitor(
+            threshold=LOOP_LAG_WARN,
+            histogram=self.metrics.histogram("event_loop_lag_seconds", "Delay of a 250ms event loop tick"),
+        )
+        self.bytes_fetched   = self.metrics.counter("downloaded_bytes_total", "Response body bytes downloaded")
+        self.fetch_responses = self.metrics.counter("fetch_responses_total", "Cloud storage responses by status")
+        self.register_probes()
+
+    def register_probes(self):
+        m = self.metrics
+        m.probe("state_reads_total", lambda: self.store.stats["reads"], "State store blob reads", "counter")
+        m.probe("state_writes_total", lambda: self.store.stats["writes"], "State store blob writes", "counter")
+        m.probe("state_read_bytes_total", lambda: self.store.stats["bytes_read"], "State store bytes read", "counter")
+        m.probe("state_written_bytes_total", lambda: self.store.stats["bytes_written"], "State store bytes written", "counter")
+        m.probe("snapshot_cache_bytes", lambda: self.snapshots.total, "Bytes held by the snapshot cache")
+        m.probe("snapshot_cache_hits_total", lambda: self.snapshots.stats["hits"], "Snapshot cache hits", "counter")
+        m.probe("snapshot_cache_misses_total", lambda: self.snapshots.stats["misses"], "Snapshot cache misses", "counter")
+        m.probe("http_connections_opened_total", lambda: self.conn_stats["created"], "TCP connections opened", "counter")
+        m.probe("http_connections_reused_total", lambda: self.conn_stats["reused"], "Pooled connections reused", "counter")
+        m.probe("publish_queue_depth", lambda: self.publisher.queue.qsize() if self.publisher else 0, "Jobs waiting to be published")
+        m.probe("publish_dropped_total", lambda: self.publisher.stats["dropped"] if self.publisher else 0, "Jobs dropped on a full queue", "counter")
+        m.probe("token_refreshes_total", lambda: self.tokens.stats["refreshes"] if self.tokens else 0, "Refresh-token grants", "counter")
+        m.probe("token_device_auths_total", lambda: self.tokens.stats["device_auths"] if self.tokens else 0, "Device-auth grants", "counter")
+        m.probe("token_failures_total", lambda: self.tokens.stats["failures"] if self.tokens else 0, "Failed token grants", "counter")
+        m.probe("open_breakers", lambda: sum(b.state == "open" for b in self.resilience.breakers.values()), "Endpoints with an open circuit")
+        m.probe("tracked_files", lambda: len(self.filename_map), "Files in the cloudstorage listing")
+        m.probe("time_to_first_poll_seconds", lambda: self.first_poll or 0.0, "Seconds from start to the first finished poll cycle")
+
+    async def setup_hook(self):
+        if METRICS_PORT and self.metrics_runner is None:
+            try:
+                self.metrics_runner = await serve_metrics(self.metrics, METRICS_HOST, METRICS_PORT)
+            except OSError as e:
+                logging.warning(f"Metrics endpoint disabled: {e}")
+        self.loop_monitor.start()
+        self.start_workers()
+        migrated = await self.persist.run(self.store.migrate_all)
+        if migrated:
+            logging.info(f"Migrated {migrated} legacy state files.")
+        self.open_session()
+        self.publisher = self.make_publisher()
+        await self.replay_journal()
+
+        checkpoint = await self.persist.read(load_checkpoint, CHECKPOINT_FILE, CHECKPOINT_MAX_AGE)
+        if checkpoint:
+            self.restore_checkpoint(checkpoint)
+        if not self.tokens.valid(TOKEN_REFRESH_MARGIN):
+            await self.tokens.refresh()
+        self.tokens.start()
+        if not self.listing:
+            await self.load_file_list()
+
+        asyncio.create_task(self.warm_snapshot_cache())
+        asyncio.create_task(self.backfill_text_index())
+        self.poll_task = asyncio.create_task(self.poll_loop())
+        logging.info(f"{'Warm' if self.warm_start else 'Cold'} start: polling {len(self.endpoints)} files after {time.monotonic() - self.started_at:.2f}s")
 
     async def on_ready(self):
         logging.info("Bot is online and ready.")
-        await self.load_file_list()
-        asyncio.create_task(self.poll_loop())
+        if self.publisher_task is None or self.publisher_task.done():
+            self.publisher_task = asyncio.create_task(self.publisher.run(self.get_channel(CHANNEL_ID)))
+
+    def make_publisher(self, rate_limit=DISCORD_RATE_LIMIT, rate_per=DISCORD_RATE_PER):
+        return Publisher(
+            PUBLISH_QUEUE_SIZE, rate_limit, rate_per, render=self.render_message, metrics=self.metrics,
+            on_sent=self.journal_sent, on_done=self.journal_done,
+        )
+
+    async def replay_journal(self):
+        pruned = await self.persist.run(self.journal.prune)
+        if pruned:
+            logging.info(f"Pruned {pruned} old publish journal entries.")
+        await self.resubmit_journal()
+
+    async def resubmit_journal(self):
+        entries = await self.persist.read(
+            self.journal.pending, PUBLISH_RETRY_BASE, PUBLISH_RETRY_MAX, set(self.journal_jobs)
+        )
+        for entry_id, friendly_name, messages, sent in entries:
+            logging.info(f"Resubmitting journaled {friendly_name} #{entry_id} from message {sent + 1}/{len(messages)}")
+            self.submit_journaled(PublishJob(friendly_name, messages, journal_id=entry_id, sent=sent))
+
+    def submit_journaled(self, job):
+        if self.publisher.submit(job) and job.journal_id is not None:
+            self.journal_jobs.add(job.journal_id)
+
+    async def journal_sent(self, job, message):
+        if job.journal_id is not None:
+            await self.persist.run(self.journal.mark_sent, job.journal_id, job.sent, getattr(message, "id", None))
+
+    async def journal_done(self, job, error):
+        if job.journal_id is None:
+            return
+        try:
+            if error is None:
+                await self.persist.run(self.journal.mark_done, job.journal_id)
+            else:
+                await self.persist.run(self.journal.mark_failed, job.journal_id, error, PUBLISH_MAX_ATTEMPTS)
+        finally:
+            self.journal_jobs.discard(job.journal_id)
+
+    def restore_checkpoint(self, checkpoint):
+        self.tokens.restore(checkpoint.get("tokens"))
+        stale = [
+            name for name, digest in (checkpoint.get("digests") or {}).items()
+            if self.store.manifest.get(name, {}).get("sha256") != digest
+        ]
+        for name in stale:
+            self.validators.pop(name, None)
+        if stale:
+            logging.info(f"Checkpoint digests disagree with the state store for {len(stale)} files — dropping their validators.")
+        if checkpoint.get("listing"):
+            self.apply_listing(checkpoint["listing"])
+            self.warm_start = True
+            logging.info(f"Restored {len(self.listing)} listing entries from checkpoint; refreshing in the first cycle.")
+
+    def write_checkpoint(self, listing, tokens, force=False):
+        digests = {name: entry["sha256"] for name, entry in self.store.manifest.items()}
+        state   = (listing, tokens, digests)
+        # unchanged state is still rewritten before saved_at gets too old for load_checkpoint to trust the listing
+        if not force and state == self.checkpoint_state and time.time() - self.checkpoint_at < CHECKPOINT_MAX_AGE / 2:
+            return
+        save_checkpoint(CHECKPOINT_FILE, listing, tokens, digests)
+        self.checkpoint_state, self.checkpoint_at = state, time.time()
+
+    async def warm_snapshot_cache(self):
+        for name, entry in list(self.store.manifest.items()):
+            if name in self.snapshots:
+                continue
+            data = await self.persist.read(self.store.load, name)
+            if data is not None and name not in self.snapshots and self.store.manifest.get(name) is entry:
+                self.snapshots.put(name, entry["sha256"], data)
+        logging.info(f"Warmed snapshot cache with {len(self.snapshots.entries)} files ({self.snapshots.total / 1024:.0f} KiB).")
+
+    async def backfill_text_index(self):
+        indexed = await self.persist.read(self.text_index.files)
+        rebuilt = 0
+        for name, entry in list(self.store.manifest.items()):
+            # files dropped from the listing keep their snapshot but must not come back into the index
+            if indexed.get(name) == entry["sha256"] or name not in self.filename_map.values():
+                continue
+            data = await self.persist.read(self.store.load, name)
+            if data is None:
+                continue
+            strings = await self.run_cpu(file_strings, data)
+            if self.store.manifest.get(name) is entry and name in self.filename_map.values():
+                await self.persist.run(self.text_index.rebuild, name, entry["sha256"], strings)
+                rebuilt += 1
+        if rebuilt:
+            logging.info(f"Backfilled text index for {rebuilt} files.")
+
+    def open_session(self):
+        if self.session and not self.session.closed:
+            return
+
+        async def on_create(sess, ctx, params):
+            self.conn_stats["created"] += 1
+
+        async def on_reuse(sess, ctx, params):
+            self.conn_stats["reused"] += 1
+
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(on_create)
+        trace.on_connection_reuseconn.append(on_reuse)
+
+        connector = aiohttp.TCPConnector(
+            limit=FETCH_CONCURRENCY * 2,
+            limit_per_host=FETCH_CONCURRENCY,
+            keepalive_timeout=HTTP_KEEPALIVE,
+            ttl_dns_cache=DNS_CACHE_TTL,
+        )
+        self.session = aiohttp.ClientSession(connector=connector, trace_configs=[trace])
+        self.tokens  = TokenManager(
+            self.session, TOKEN_URL, CLIENT_SECRET, DEVICE_ID, DEVICE_SECRET, ACCOUNT_ID, TOKEN_REFRESH_MARGIN
+        )
+        logging.info(f"Opened HTTP session (per-host limit {FETCH_CONCURRENCY}, keep-alive {HTTP_KEEPALIVE}s).")
+
+    async def close(self):
+        await self.shutdown()
+        await super().close()
+
+    async def shutdown(self):
+        for task in (self.poll_task, self.publisher_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                except Exception as e:
+                    logging.warning(f"Task ended with error during shutdown: {e}")
+        if self.tokens:
+            await self.tokens.stop()
+            self.persist.write(self.write_checkpoint, dict(self.listing), self.tokens.export(), force=True)
+        if self.session and not self.session.closed:
+            await self.session.close()
+            logging.info("Closed HTTP session.")
+        if self.metrics_runner:
+            await self.metrics_runner.cleanup()
+        self.loop_monitor.stop()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+        await self.persist.close()
+        self.history.close()
+        self.journal.close()
+        self.text_index.close()
 
     async def load_file_list(self):
         logging.info("Fetching system file list…")
         text = await self.fetch_json(SYSTEM_API_URL)
-        data = json.loads(text)
-        for entry in data:
-            ufn = entry.get("uniqueFilename")
-            fname = entry.get("filename")
-            if ufn and fname:
-                self.filename_map[ufn] = fname
-                self.endpoints.append(f"{SYSTEM_API_URL}/{ufn}")
+        self.apply_listing(parse_listing(text))
         logging.info(f"Loaded {len(self.endpoints)} files to track.")
 
-    async def device_auth(self):
-        data = {
-            "grant_type":   "device_auth",
-            "device_id":    DEVICE_ID,
-            "secret":       DEVICE_SECRET,
-            "account_id":   ACCOUNT_ID
-        }
-        headers = {
-            "Content-Type":  "application/x-www-form-urlencoded",
-            "Authorization": f"Basic {CLIENT_SECRET}"
-        }
-        async with aiohttp.ClientSession() as sess:
-            resp = await sess.post(TOKEN_URL, data=data, headers=headers)
-            resp.raise_for_status()
-            j = await resp.json()
-            logging.info("Obtained new device refresh token.")
-            return j["refresh_token"]
-
-    async def refresh_access_token(self):
-        if not self.refresh_token:
-            self.refresh_token = await self.device_auth()
-        data = {
-            "grant_type":    "refresh_token",
-            "refresh_token": self.refresh_token,
-            "token_type":    "eg1"
-        }
-        headers = {
-            "Content-Type":     "application/x-www-form-urlencoded",
-            "Authorization":    f"Basic {CLIENT_SECRET}",
-            "X-Epic-Device-ID": "device_auth"
-        }
-        async with aiohttp.ClientSession() as sess:
-            resp = await sess.post(TOKEN_URL, data=data, headers=headers)
-            resp.raise_for_status()
-            j = await resp.json()
-            self.access_token     = j["access_token"]
-            self.token_expires_at = datetime.utcnow() + timedelta(minutes=14)
-            logging.info("Refreshed access token.")
+    def apply_listing(self, listing):
+        self.listing      = listing
+        self.filename_map = {ufn: e["filename"] for ufn, e in listing.items()}
+        self.endpoints    = [f"{SYSTEM_API_URL}/{ufn}" for ufn in listing]
 
-    async def fetch_json(self, url):
-        if not self.access_token or datetime.utcnow() >= self.token_expires_at:
-            await self.refresh_access_token()
+        self.scheduler.add(LISTING_KEY, POLL_MIN_INTERVAL, POLL_INTERVAL, interval=POLL_INTERVAL, delay=0.0)
+        for ufn in listing:
+            self.scheduler.add(ufn, POLL_INTERVAL, POLL_MAX_INTERVAL)
+        for key in list(self.scheduler.intervals):
+            if key != LISTING_KEY and key not in listing:
+                self.scheduler.remove(key)
+
+    async def fetch_listing(self):
+        try:
+            text = await self.resilience.call(
+                "listing", lambda: asyncio.wait_for(self.fetch_json(SYSTEM_API_URL), FETCH_TIMEOUT)
+            )
+            return parse_listing(text)
+        except Exception as e:
+            logging.info(f"Listing fetch error: {e} — falling back to conditional GETs")
+            return None
+
+    async def index_stage(self):
+        listing = await self.fetch_listing()
+        if listing is None:
+            return list(self.endpoints), []
+
+        added, removed, changed = diff_listing(
+            self.listing, listing,
+            unchanged=lambda ufn, e: self.listing_unchanged(e["filename"], e),
+        )
+        unchanged = len(listing) - len(added) - len(changed)
+        logging.info(f"Listing: {len(added)} new, {len(removed)} removed, {len(changed)} changed, {unchanged} unchanged")
+
+        for ufn in added:
+            logging.info(f"New file in listing: {listing[ufn]['filename']}")
+        removed_names = []
+        for ufn in removed:
+            friendly_name = self.filename_map.get(ufn, ufn)
+            logging.info(f"File removed from listing: {friendly_name}")
+            self.resilience.forget(friendly_name)
+            if self.validators.pop(friendly_name, None) is not None:
+                self.validators_dirty = True
+            removed_names.append(friendly_name)
+            self.persist.write(self.text_index.drop, friendly_name)
+
+        self.apply_listing(listing)
+        return [f"{SYSTEM_API_URL}/{ufn}" for ufn in added + changed], removed_names
+
+    def save_validators(self):
+        self.persist.write(write_json, VALIDATORS_FILE, dict(self.validators), 2)
+
+    def listing_unchanged(self, friendly_name, entry):
+        saved = self.validators.get(friendly_name)
+        if not saved or not entry:
+            return False
+        if not self.store.has(friendly_name):
+            return False
+        if not any(entry.get(k) for k in LISTING_FIELDS):
+            return False
+        return all(saved.get(k) == entry.get(k) for k in LISTING_FIELDS)
+
+    async def _send_get(self, url, token, extra_headers=None):
         headers = {
-            "Authorization": f"Bearer {self.access_token}",
+            "Authorization": f"Bearer {token}",
             "User-Agent":    "Mozilla/5.0"
         }
-        async with aiohttp.ClientSession() as sess:
-            resp = await sess.get(url, headers=headers)
-            if resp.status == 401:
-                logging.info("Access token expired, refreshing…")
-                await self.refresh_access_token()
-                headers["Authorization"] = f"Bearer {self.access_token}"
-                resp = await sess.get(url, headers=headers)
+        if extra_headers:
+            headers.update(extra_headers)
+        async with self.session.get(url, headers=headers) as resp:
+            self.fetch_responses.inc(status=resp.status)
+            if resp.status in (304, 401):
+                return resp.status, None, resp.headers
             resp.raise_for_status()
-            return await resp.text()
+            body = StreamingBody()
+            async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                body.feed(chunk)
+            self.bytes_fetched.inc(body.size)
+            return resp.status, body, resp.headers
+
+    async def authorized_get(self, url, extra_headers=None):
+        endpoint = self.filename_map.get(url.rsplit("/", 1)[-1], "listing")
+        with self.fetch_seconds.time(endpoint=endpoint):
+            return await self._authorized_get(url, extra_headers)
+
+    async def _authorized_get(self, url, extra_headers=None):
+        token = await self.tokens.get_token()
+        status, body, headers = await self._send_get(url, token, extra_headers)
+        if status == 401:
+            logging.info("Access token expired, refreshing…")
+            token = await self.tokens.refresh(stale_token=token)
+            status, body, headers = await self._send_get(url, token, extra_headers)
+            if status == 401:
+                raise aiohttp.ClientError(f"401 Unauthorized for {url}")
+        return status, body, headers
 
-    def _parse_hotfix_strings(self, lines):
-        pat = re.compile(
-            r'\+TextReplacements=.*?Key="(?P<k>[^"]+)".*?LocalizedStrings=\(\((?P<i>.+?)\)\)\)\n'
+    async def fetch_json(self, url):
+        _, body, _ = await self.authorized_get(url)
+        return body.text()
+
+    def render_message(self, message):
+        kwargs = {"content": message.get("content")}
+        if message.get("embeds"):
+            kwargs["embeds"] = []
+            for spec in message["embeds"]:
+                e = Embed(title=spec["title"], description=spec["description"])
+                for name, value in spec["fields"]:
+                    e.add_field(name=name, value=value, inline=False)
+                kwargs["embeds"].append(e)
+        if message.get("attachments"):
+            kwargs["files"] = [File(fp=io.BytesIO(data), filename=name) for name, data in message["attachments"]]
+        return kwargs
+
+    async def fetch_one(self, sem, queue, url):
+        key           = url.rsplit("/", 1)[-1]
+        friendly_name = self.filename_map.get(key, key)
+        entry         = self.listing.get(key, {})
+
+        saved        = self.validators.get(friendly_name, {})
+        cond_headers = {}
+        if self.store.has(friendly_name):
+            if saved.get("etag"):
+                cond_headers["If-None-Match"] = saved["etag"]
+            if saved.get("last_modified"):
+                cond_headers["If-Modified-Since"] = saved["last_modified"]
+
+        async def attempt():
+            async with sem:
+                return await asyncio.wait_for(self.authorized_get(url, cond_headers), FETCH_TIMEOUT)
+
+        body, validators = None, None
+        try:
+            status, body, headers = await self.resilience.call(friendly_name, attempt)
+            validators = {
+                "unique_filename": key,
+                "etag":            headers.get("ETag", saved.get("etag")),
+                "last_modified":   headers.get("Last-Modified", saved.get("last_modified")),
+                **{k: entry.get(k) for k in LISTING_FIELDS},
+            }
+            if status == 304:
+                logging.info(f"[{friendly_name}] 304 Not Modified.")
+                self.validators[friendly_name] = validators
+                self.validators_dirty = True
+                validators = None
+        except CircuitOpenError as e:
+            logging.info(f"[{friendly_name}] {e} — skipping")
+        except asyncio.TimeoutError:
+            logging.info(f"[{friendly_name}] fetch timed out after {FETCH_TIMEOUT}s — skipping")
+        except Exception as e:
+            logging.info(f"[{friendly_name}] fetch error: {e} — skipping")
+        await queue.put((friendly_name, body, validators))
+
+    async def poll_cycle(self, due):
+        self.cycle_files = set()
+        listing          = self.listing
+        try:
+            await self.run_cycle(due)
+        except BaseException:
+            self.abandon_cycle(listing)
+            raise
+        self.cycle_files = None
+
+    def abandon_cycle(self, listing):
+        # nothing of an unfinished cycle may reach disk without its journal entry
+        dropped = self.persist.discard()
+        for name in self.cycle_files or ():
+            self.snapshots.discard(name)
+            self.section_tables.pop(name, None)
+            self.validators.pop(name, None)
+        if self.listing is not listing:
+            self.apply_listing(listing)
+        if dropped or self.cycle_files:
+            logging.warning(f"Abandoned unfinished poll cycle: dropped {dropped} queued writes for {len(self.cycle_files or ())} files")
+        self.cycle_files = None
+
+    async def run_cycle(self, due):
+        self.validators_dirty = False
+        urls, removed = [], []
+        if LISTING_KEY in due:
+            urls, removed = await self.index_stage()
+        for ufn in due:
+            url = f"{SYSTEM_API_URL}/{ufn}"
+            if ufn in self.filename_map and url not in urls:
+                urls.append(url)
+
+        sem     = asyncio.Semaphore(FETCH_CONCURRENCY)
+        queue   = asyncio.Queue()
+        fetches = [asyncio.create_task(self.fetch_one(sem, queue, url)) for url in urls]
+
+        processing = []
+        for _ in range(len(fetches)):
+            friendly_name, body, validators = await queue.get()
+            if body is not None:
+                processing.append(asyncio.create_task(self.process_one(friendly_name, body, validators)))
+
+        await asyncio.gather(*fetches)
+        updates = [u for u in await asyncio.gather(*processing) if u]
+
+        if (updates or removed) and self.scheduler.burst():
+            logging.info(f"Change detected — burst polling all files for {BURST_WINDOW:.0f}s")
+        changed = {u.friendly_name for u in updates}
+        if LISTING_KEY in due:
+            self.scheduler.observe(LISTING_KEY, bool(updates or removed))
+        for url in urls:
+            ufn = url.rsplit("/", 1)[-1]
+            self.scheduler.observe(ufn, self.filename_map.get(ufn) in changed)
+
+        covers = [(u.friendly_name, u.old_digest, u.digest) for u in updates if u.digest]
+        if covers:
+            seen = await self.persist.read(self.journal.announced, covers)
+            if seen:
+                logging.info(f"Skipping {len(seen)} changes already announced: {', '.join(sorted(c[0] for c in seen))}")
+                updates = [u for u in updates if (u.friendly_name, u.old_digest, u.digest) not in seen]
+                covers  = [c for c in covers if c not in seen]
+
+        with self.digest_seconds.time():
+            messages = await self.run_cpu(build_digest, updates, removed, f"<@&{PING_ROLE_ID}>")
+        journal_id = None
+        if messages:
+            # journal before the snapshot writes below so a crash never loses an announcement;
+            # if the append fails the error reaches poll_cycle, which abandons the queued writes
+            journal_id = await self.persist.run(self.journal.append, "cycle digest", messages, covers)
+
+        if self.validators_dirty:
+            self.save_validators()
+        self.persist.write(self.write_checkpoint, dict(self.listing), self.tokens.export())
+        await self.persist.flush()
+
+        if messages:
+            self.submit_journaled(PublishJob("cycle digest", messages, journal_id=journal_id))
+            logging.info(f"Queued cycle digest for {len(updates)} updated and {len(removed)} removed files ({len(messages)} messages)")
+        await self.resubmit_journal()
+
+    def record_history(self, friendly_name, digest, new_data, old_data, old_digest, modifications=()):
+        ufn = next((u for u, n in self.filename_map.items() if n == friendly_name), None)
+        self.persist.write(
+            self.write_history, friendly_name, digest, new_data, old_data, old_digest, modifications, ufn
         )
-        en = re.compile(r'\("en","(?P<t>[^"]+)"\)')
-        out = []
-        for l in lines:
-            m = pat.search(l)
-            if not m:
-                continue
-            inner = m.group("i")
-            m2 = en.search(inner)
-            if m2:
-                out.append((m.group("k"), m2.group("t")))
-        return out
-
-    def _parse_datatable(self, lines, sign):
-        out = []
-        for l in lines:
-            if f"{sign}DataTable=" not in l:
-                continue
-            body = l.lstrip(f"{sign} ").rstrip()
-            try:
-                _, rest = body.split("=", 1)
-            except ValueError:
-                continue
-            parts = rest.split(";", 4)
-            if len(parts) == 5:
-                path, action, row, field, value = parts
-                out.append((path, row, field, value, sign))
-            elif len(parts) == 3:
-                path, action, inner = parts
-                if action == "AddRow":
-                    try:
-                        inner_content = inner[1:-1] if (inner.startswith('"') and inner.endswith('"')) else inner
-                        data = json.loads(inner_content)
-                        row_name = data.get("Name", "")
-                        wrapped_str = data.get("WrappedString", "")
-                        out.append((path, row_name, "WrappedString", wrapped_str, sign))
-                    except json.JSONDecodeError:
-                        logging.warning(f"[parse_datatable] JSON‐decode failed: {inner}")
-                elif action == "TableUpdate":
-                    try:
-                        inner_content = inner[1:-1] if (inner.startswith('"') and inner.endswith('"')) else inner
-                        data_list = json.loads(inner_content)
-                        for entry in data_list:
-                            name = entry.get("Name","")
-                            ti_obj = entry.get("TaskIdentifier",{})
-                            task_tag = ti_obj.get("TagName","") if isinstance(ti_obj,dict) else ""
-                            link = entry.get("LinkedQuestDefinition","")
-                            out.append((path,name,"TaskIdentifier.TagName",task_tag,sign))
-                            out.append((path,name,"LinkedQuestDefinition",link,sign))
-                    except json.JSONDecodeError:
-                        logging.warning(f"[parse_datatable] JSON‐decode failed: {inner}")
-        return out
-
-    def _parse_curvetable(self, lines, sign):
-        out = []
-        for l in lines:
-            if f"{sign}CurveTable=" not in l:
-                continue
-            body = l.lstrip(f"{sign} ").rstrip()
-            try:
-                _, rest = body.split("=",1)
-            except ValueError:
-                continue
-            parts = rest.split(";",4)
-            if len(parts) < 5:
-                continue
-            path, action, identifier, input_val, new_val = parts
-            if "." not in identifier:
-                continue
-            row, field = identifier.rsplit(".",1)
-            out.append((path, row, field, new_val, sign))
-        return out
 
-    async def send_embed_safe(self, channel, embed, file=None):
+    def write_history(self, friendly_name, digest, new_data, old_data, old_digest, modifications, ufn):
+        # lines are only needed here, so they are split on the persist thread rather than the event loop
         try:
-            await channel.send(embed=embed, file=file)
-            logging.info("Message sent successfully")
-        except discord.HTTPException as he:
-            msg = str(he).lower()
-            if "embeds too large" in msg or "maximum number of embeds" in msg:
-                fields = embed.fields
-                chunks = [fields[i:i+5] for i in range(0,len(fields),5)]
-                for idx, chunk in enumerate(chunks,1):
-                    part = Embed(title=f"{embed.title} (part {idx}/{len(chunks)})")
-                    for f in chunk:
-                        part.add_field(name=f.name, value=f.value, inline=f.inline)
-                    try:
-                        await channel.send(embed=part)
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+            self.history.record_version(
+                friendly_name, digest, new_data.decode("utf-8").splitlines(keepends=True),
+                old_lines=old_data.decode("utf-8").splitlines(keepends=True), old_sha256=old_digest,
+                modifications=modifications, unique_filename=ufn,
+            )
+        except Exception as e:
+            logging.warning(f"[{friendly_name}] history write failed: {e}")
+
+    async def section_index(self, friendly_name, digest, data):
+        cached = self.section_tables.get(friendly_name)
+        if cached and cached[0] == digest:
+            return cached[1]
+        table = await self.persist.read(self.store.load_index, digest) if digest else None
+        if table is None:
+            table = await self.run_cpu(section_table, data)
+            if digest:
+                self.persist.write(self.store.put_index, digest, table)
+        self.section_tables[friendly_name] = (digest, table)
+        return table
+
+    def save_snapshot(self, friendly_name, digest, data, table):
+        self.persist.put_snapshot(friendly_name, data, digest, table)
+        self.snapshots.put(friendly_name, digest, data)
+        self.section_tables[friendly_name] = (digest, table)
+        if self.cycle_files is not None:
+            self.cycle_files.add(friendly_name)
+
+    async def run_cpu(self, fn, *args):
+        pool = self.pool
+        if pool is None:
+            return fn(*args)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            # a worker died (OOM kill, segfault); the pool refuses all further work until replaced
+            if self.pool is pool:
+                logging.warning("Analysis worker pool broke — restarting it and retrying once")
+                pool.shutdown(wait=False, cancel_futures=True)
+                self.pool = None
+                self.start_workers()
+            return await asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+
+    def start_workers(self):
+        if self.pool is not None or ANALYSIS_EXECUTOR == "inline":
+            return
+        if ANALYSIS_EXECUTOR == "thread":
+            self.pool = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="analysis")
+        else:
+            # forking a process that runs the event loop and sqlite connections would copy their locks
+            self.pool = ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS, mp_context=multiprocessing.get_context("forkserver"))
+        logging.info(f"Started {ANALYSIS_WORKERS} {ANALYSIS_EXECUTOR} analysis workers.")
+
+    async def process_file(self, friendly_name, body):
+        new_bytes  = body.data
+        new_digest = body.digest
+        old_digest = self.snapshots.digest(friendly_name) or self.store.digest(friendly_name)
+        if old_digest == new_digest:
+            logging.info(f"[{friendly_name}] No changes found (content hash match).")
+            return
+
+        old_data = self.snapshots.data(friendly_name)
+        if old_data is None:
+            old_data = await self.persist.read(self.store.load, friendly_name) or b""
+
+        old_table = await self.section_index(friendly_name, old_digest, old_data)
+        task      = AnalysisTask(friendly_name, old_data, new_bytes, old_table, DIFF_MODE)
+        result    = await self.run_cpu(analyze, task)
+        self.diff_seconds.observe(result.diff_time)
+
+        if not (result.added or result.removed or result.moved):
+            logging.info(f"[{friendly_name}] No changes found.")
+            self.save_snapshot(friendly_name, new_digest, new_bytes, result.new_table)
+            self.index_strings(friendly_name, old_digest, new_digest, new_bytes, [], [])
+            self.record_history(friendly_name, new_digest, new_bytes, old_data, old_digest)
+            return
+
+        self.parse_seconds.observe(result.parse_time)
+        added, removed, moved = result.added, result.removed, result.moved
+        logging.info(f"Change found in {friendly_name} (+{len(added)}/-{len(removed)}/~{len(moved)}, {result.chunks_changed}/{len(result.new_table)} chunks in {result.sections} sections) — processing")
+        if result.semantic:
+            logging.info(f"[{friendly_name}] {len(result.semantic)} semantic changes across {len({c['section'] for c in result.semantic})} sections")
+        self.save_snapshot(friendly_name, new_digest, new_bytes, result.new_table)
+        self.index_strings(friendly_name, old_digest, new_digest, new_bytes, result.strings_added, result.strings_removed)
+
+        modifications = result.modifications
+        self.record_history(friendly_name, new_digest, new_bytes, old_data, old_digest, modifications)
+
+        diff_payload = {"added": added, "removed": removed}
+        if moved:
+            diff_payload["moved"] = moved
+        if result.semantic:
+            diff_payload["semantic"] = result.semantic
+
+        if result.parsed_total == 0:
+            logging.info(f"No parsed mods for {friendly_name}; raw diff goes into the cycle digest.")
+            return FileUpdate(friendly_name, [], diff_payload, new_digest, old_digest)
+
+        # write out parsed summary JSON
+        parsed_path = os.path.join(STATE_DIR, f"{friendly_name}_parsed.json")
+        self.persist.write(write_json, parsed_path, [{
+            "section_name": friendly_name,
+            "modifications": modifications,
+        }], 4)
+
+        logging.info(f"Parsed {len(modifications)} mods for {friendly_name} (+{len(added)}/-{len(removed)})")
+        return FileUpdate(friendly_name, modifications, diff_payload, new_digest, old_digest)
+
+    def index_strings(self, friendly_name, old_digest, digest, data, added, removed):
+        # the full string list is only extracted if the index is not at old_digest (e.g. backfill hasn't reached it)
+        self.persist.write(
+            self.text_index.update, friendly_name, digest, added, removed,
+            old_sha256=old_digest, strings=partial(file_strings, data),
+        )
+
+    async def process_one(self, friendly_name, body, validators):
+        try:
+            update = await self.process_file(friendly_name, body)
+        except Exception as e:
+            logging.info(f"[{friendly_name}] processing error: {e}")
+            return None
+        self.validators[friendly_name] = validators
+        self.validators_dirty = True
+        return update
 
     async def poll_loop(self):
-        await self.wait_until_ready()
-        channel = self.get_channel(CHANNEL_ID)
-        logging.info(f"Starting poll loop against {len(self.endpoints)} endpoints.")
+        logging.info(f"Starting poll loop against {len(self.endpoints)} endpoints (concurrency {FETCH_CONCURRENCY}).")
 
         while True:
-            logging.info("Fetching data from Cloud Storage endpoints…")
-            for url in self.endpoints:
-                key           = url.rsplit("/", 1)[-1]
-                friendly_name = self.filename_map.get(key, key)
-                state_file    = os.path.join(STATE_DIR, f"{friendly_name}.json")
+            wait = self.scheduler.wait_time()
+            if wait is None:
+                wait = POLL_INTERVAL
+            if wait > 0:
+                logging.info(f"Waiting {wait:.1f}s before next poll")
+                await asyncio.sleep(wait)
+            due = self.scheduler.pop_due()
+            if not due:
+                continue
 
-                try:
-                    text = await self.fetch_json(url)
-                except Exception as e:
-                    logging.info(f"[{friendly_name}] fetch error: {e} — skipping")
-                    continue
-
-                new_lines = text.splitlines(keepends=True)
-                old_lines = []
-                if os.path.isfile(state_file):
-                    with open(state_file, "r", encoding="utf-8") as f:
-                        old_lines = json.load(f)
-
-                added   = [l for l in new_lines if l not in old_lines]
-                removed = [l for l in old_lines if l not in new_lines]
-
-                if not (added or removed):
-                    logging.info(f"[{friendly_name}] No changes found.")
-                    continue
-
-                logging.info(f"Change found in {friendly_name} (+{len(added)}/-{len(removed)}) — processing")
-                ping_msg = f"<@&{PING_ROLE_ID}> {friendly_name} has been updated"
-
-                with open(state_file, "w", encoding="utf-8") as f:
-                    json.dump(new_lines, f, indent=2)
-
-                dt_plus       = self._parse_datatable(added, "+")
-                dt_minus      = self._parse_datatable(removed, "-")
-                ct_plus       = self._parse_curvetable(added, "+")
-                ct_minus      = self._parse_curvetable(removed, "-")
-                hotfixes_plus = self._parse_hotfix_strings(added)
-
-                diff_payload = {"added": added, "removed": removed}
-                diff_bytes   = json.dumps(diff_payload, indent=2).encode("utf-8")
-                diff_file    = File(fp=io.BytesIO(diff_bytes), filename=f"{friendly_name}_diff.json")
-
-                total_parsed = (
-                    len(hotfixes_plus)
-                    + len(dt_plus)
-                    + len(dt_minus)
-                    + len(ct_plus)
-                    + len(ct_minus)
-                )
-
-                if total_parsed == 0:
-                    await channel.send(content=ping_msg, file=diff_file)
-                    logging.info(f"No parsed mods; sent raw diff JSON for {friendly_name}.")
-                    continue
-
-                embeds = []
-
-                dt_changes = dt_plus + dt_minus
-                if dt_changes:
-                    by_path = {}
-                    for path, row, field, val, sign in dt_changes:
-                        by_path.setdefault(path, []).append((row, field, val, sign))
-                    for path, mods in by_path.items():
-                        num_parts = math.ceil(len(mods)/25)
-                        for pi in range(num_parts):
-                            chunk = mods[pi*25:(pi+1)*25]
-                            e = Embed(title="Summary")
-                            e.description = f"➥ **DataTable Modification:** ```{path}```"
-                            for row, field, val, sign in chunk:
-                                e.add_field(name=f"`{row} → {field}`", value=val, inline=False)
-                            embeds.append(e)
-
-                ct_changes = ct_plus + ct_minus
-                if ct_changes:
-                    by_path = {}
-                    for path, row, field, val, sign in ct_changes:
-                        by_path.setdefault(path, []).append((row, field, val, sign))
-                    for path, mods in by_path.items():
-                        num_parts = math.ceil(len(mods)/25)
-                        for pi in range(num_parts):
-                            chunk = mods[pi*25:(pi+1)*25]
-                            e = Embed(title="Summary")
-                            e.description = f"```{path}```"
-                            for row, field, val, sign in chunk:
-                                e.add_field(name=f"`{row}.{field}`", value=val, inline=False)
-                            embeds.append(e)
-
-                if hotfixes_plus:
-                    num_parts = math.ceil(len(hotfixes_plus)/25)
-                    for pi in range(num_parts):
-                        chunk = hotfixes_plus[pi*25:(pi+1)*25]
-                        e = Embed(title="Summary")
-                        e.description = "➥ **String modification detected**"
-                        for key, text in chunk:
-                            e.add_field(name=f"**{key}**", value=f"➥ {text}", inline=False)
-                        embeds.append(e)
-
-                # write out parsed summary JSON
-                parsed_path = os.path.join(STATE_DIR, f"{friendly_name}_parsed.json")
-                with open(parsed_path, "w", encoding="utf-8") as f:
-                    json.dump([{
-                        "section_name": friendly_name,
-                        "modifications": [
-                            *[{"type":"String","key":k,"value":t} for k,t in hotfixes_plus],
-                            *[{"type":"DataTable","path":p,"row_name":r,"field":f,"new_value":v,"change":("Added" if s=="+" else "Removed")} for p,r,f,v,s in dt_plus+dt_minus],
-                            *[{"type":"CurveTable","path":p,"row_name":r,"field":f,"new_value":v,"change":("Added" if s=="+" else "Removed")} for p,r,f,v,s in ct_plus+ct_minus],
-                        ]
-                    }], f, indent=4, ensure_ascii=False)
-
-                with open(parsed_path, "rb") as fp:
-                    parsed_file = File(fp, filename=os.path.basename(parsed_path))
-
-                all_embeds = embeds
-                for i in range(0, len(all_embeds), 10):
-                    chunk = all_embeds[i:i+10]
-                    if i + 10 >= len(all_embeds):
-                        await channel.send(content=ping_msg, embeds=chunk, file=parsed_file)
-                    else:
-                        await channel.send(content=ping_msg, embeds=chunk)
-
-                logging.info(f"Sent update for {friendly_name} (+{len(added)}/-{len(removed)})")
-
-            logging.info(f"Waiting {POLL_INTERVAL}s before next poll")
-            await asyncio.sleep(POLL_INTERVAL)
+            logging.info(f"Fetching data from Cloud Storage endpoints… ({len(due)} due)")
+            started = time.perf_counter()
+            try:
+                await self.poll_cycle(due)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # pop_due already took these keys off the schedule; put them back or they are never polled again
+                logging.exception(f"Poll cycle failed — rescheduling {len(due)} due keys")
+                for key in due:
+                    self.scheduler.observe(key, False)
+                continue
+            elapsed = time.perf_counter() - started
+            self.cycle_seconds.observe(elapsed)
+            logging.info(f"Poll cycle finished in {elapsed:.2f}s")
+            if self.first_poll is None:
+                self.first_poll = time.monotonic() - self.started_at
+                logging.info(f"Time to first poll: {self.first_poll:.2f}s ({'warm' if self.warm_start else 'cold'} start)")
+            logging.info(f"HTTP connections: {self.conn_stats['created']} opened, {self.conn_stats['reused']} reused")
+            logging.info(f"State store: {self.store.stats['reads']} reads ({self.store.stats['bytes_read']} B), {self.store.stats['writes']} writes ({self.store.stats['bytes_written']} B)")
+            logging.info(f"Snapshot cache: {len(self.snapshots.entries)} files, {self.snapshots.total / 1024:.0f} KiB, {self.snapshots.stats['hits']} hits, {self.snapshots.stats['misses']} misses, {self.snapshots.stats['evictions']} evictions")
+            logging.info(f"Publish queue: {self.publisher.summary()}")
+            logging.info(f"Publish journal: {await self.persist.read(self.journal.summary)}")
+            logging.info(f"Endpoints: {self.resilience.summary()}")
+            logging.info(f"Tokens: {self.tokens.stats['refreshes']} refreshes, {self.tokens.stats['device_auths']} device auths, {self.tokens.stats['failures']} failures")
+            logging.info(f"Persistence: {self.persist.summary()}")
+            logging.info(f"Text index: {self.text_index.summary()}")
+            logging.info(f"Event loop lag: {self.loop_monitor.summary()}")
+            logging.info(f"Scheduler: {self.scheduler.stats['polls']} polls, {self.scheduler.stats['changes']} changes, {self.scheduler.stats['bursts']} bursts, listing every {self.scheduler.intervals[LISTING_KEY]:.0f}s")
 
 
 if __name__ == "__main__":
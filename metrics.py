@@ -0,0 +1,156 @@
+import time
+import bisect
+import logging
+from contextlib import contextmanager
+
+from aiohttp import web
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _format(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help):
+        self.name   = name
+        self.help   = help
+        self.series = {}
+
+    def inc(self, value=1, **labels):
+        key = tuple(sorted(labels.items()))
+        self.series[key] = self.series.get(key, 0) + value
+
+    def samples(self):
+        for labels, value in self.series.items():
+            yield self.name, labels, value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        self.series[tuple(sorted(labels.items()))] = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, buckets=DEFAULT_BUCKETS):
+        self.name    = name
+        self.help    = help
+        self.buckets = tuple(sorted(buckets))
+        self.series  = {}
+
+    def observe(self, value, **labels):
+        key    = tuple(sorted(labels.items()))
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def totals(self):
+        return sum(s[2] for s in self.series.values()), sum(s[1] for s in self.series.values())
+
+    def quantile(self, q):
+        counts = [sum(s[0][i] for s in self.series.values()) for i in range(len(self.buckets) + 1)]
+        target = q * sum(counts)
+        seen   = 0
+        for bound, n in zip(self.buckets + (float("inf"),), counts):
+            seen += n
+            if n and seen >= target:
+                return bound
+        return 0.0
+
+    def samples(self):
+        for labels, (counts, total, count) in self.series.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                yield f"{self.name}_bucket", labels + (("le", _format(float(bound))),), cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class Registry:
+    def __init__(self, prefix=""):
+        self.prefix  = prefix
+        self.metrics = {}
+        self.probes  = []
+
+    def _get(self, cls, name, help, *args):
+        name = self.prefix + name
+        if name not in self.metrics:
+            self.metrics[name] = cls(name, help, *args)
+        return self.metrics[name]
+
+    def counter(self, name, help=""):
+        return self._get(Counter, name, help)
+
+    def gauge(self, name, help=""):
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name, help="", buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help, buckets)
+
+    def probe(self, name, fn, help="", kind="gauge"):
+        metric = self.counter(name, help) if kind == "counter" else self.gauge(name, help)
+        self.probes.append((metric, fn))
+
+    def render(self):
+        for metric, fn in self.probes:
+            try:
+                value = fn()
+            except Exception as e:
+                logging.warning(f"Metric probe {metric.name} failed: {e}")
+                continue
+            metric.series[()] = value
+
+        lines = []
+        for metric in self.metrics.values():
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_label_text(labels)} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+
+async def serve(registry, host="127.0.0.1", port=9108):
+    async def handle(request):
+        return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logging.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return runner
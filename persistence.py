@@ -0,0 +1,67 @@
+import json
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from state_store import atomic_write
+
+
+def write_json(path, obj, indent=None):
+    atomic_write(path, json.dumps(obj, indent=indent, ensure_ascii=False).encode("utf-8"))
+
+
+class Persistence:
+    def __init__(self, store):
+        self.store    = store
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="persist")
+        self.pending  = []
+        self.stats    = {"batches": 0, "writes": 0, "errors": 0, "reads": 0}
+
+    async def run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def read(self, fn, *args):
+        self.stats["reads"] += 1
+        return await self.run(fn, *args)
+
+    def write(self, fn, *args, **kwargs):
+        self.pending.append((fn, args, kwargs))
+
+    def put_snapshot(self, name, data, digest, table):
+        self.write(self.store.put, name, data, digest, save=False)
+        self.write(self.store.put_index, digest, table)
+
+    def _apply(self, batch):
+        errors = 0
+        for fn, args, kwargs in batch:
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                errors += 1
+                logging.warning(f"Persist {getattr(fn, '__name__', fn)} failed: {e}")
+        if self.store.dirty:
+            self.store.save_manifest()
+        return errors
+
+    async def flush(self):
+        if not self.pending:
+            return 0
+        batch, self.pending = self.pending, []
+        errors = await self.run(self._apply, batch)
+        self.stats["batches"] += 1
+        self.stats["writes"]  += len(batch)
+        self.stats["errors"]  += errors
+        return len(batch)
+
+    def discard(self):
+        dropped, self.pending = len(self.pending), []
+        return dropped
+
+    async def close(self):
+        # queued behind any in-flight batch on the same thread
+        await self.flush()
+        self.executor.shutdown(wait=True)
+
+    def summary(self):
+        s = self.stats
+        return f"{s['batches']} batches, {s['writes']} writes, {s['reads']} reads, {s['errors']} errors"
@@ -0,0 +1,150 @@
+import json
+import base64
+import sqlite3
+from datetime import datetime, timezone, timedelta
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id            INTEGER PRIMARY KEY,
+    created_at    TEXT NOT NULL,
+    friendly_name TEXT NOT NULL,
+    messages      TEXT NOT NULL,
+    status        TEXT NOT NULL DEFAULT 'pending',
+    sent_count    INTEGER NOT NULL DEFAULT 0,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    message_ids   TEXT NOT NULL DEFAULT '[]',
+    last_error    TEXT,
+    finished_at   TEXT
+);
+CREATE TABLE IF NOT EXISTS covers (
+    entry_id   INTEGER NOT NULL REFERENCES entries(id),
+    name       TEXT NOT NULL,
+    old_sha256 TEXT NOT NULL DEFAULT '',
+    sha256     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_status ON entries(status, id);
+"""
+COVERS_INDEX = "CREATE INDEX IF NOT EXISTS idx_covers_change ON covers(name, old_sha256, sha256)"
+
+
+def encode_messages(messages):
+    out = []
+    for message in messages:
+        m = dict(message)
+        if m.get("attachments"):
+            m["attachments"] = [(name, base64.b64encode(data).decode("ascii")) for name, data in m["attachments"]]
+        out.append(m)
+    return json.dumps(out, ensure_ascii=False)
+
+
+def decode_messages(text):
+    messages = json.loads(text)
+    for m in messages:
+        if m.get("embeds"):
+            for e in m["embeds"]:
+                e["fields"] = [tuple(f) for f in e["fields"]]
+        if m.get("attachments"):
+            m["attachments"] = [(name, base64.b64decode(data)) for name, data in m["attachments"]]
+    return messages
+
+
+class PublishJournal:
+    def __init__(self, path):
+        self.path = path
+        self.db   = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=FULL")
+        self.db.executescript(SCHEMA)
+        columns = {r["name"] for r in self.db.execute("PRAGMA table_info(covers)")}
+        if "old_sha256" not in columns:
+            # covers keyed on the new digest alone can't tell A->B->A apart; drop them
+            self.db.execute("ALTER TABLE covers ADD COLUMN old_sha256 TEXT NOT NULL DEFAULT ''")
+            self.db.execute("DELETE FROM covers")
+            self.db.execute("DROP INDEX IF EXISTS idx_covers_file")
+        self.db.execute(COVERS_INDEX)
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    def append(self, friendly_name, messages, covers=()):
+        with self.db:
+            cur = self.db.execute(
+                "INSERT INTO entries (created_at, friendly_name, messages) VALUES (?, ?, ?)",
+                (datetime.now(timezone.utc).isoformat(), friendly_name, encode_messages(messages)),
+            )
+            self.db.executemany(
+                "INSERT INTO covers (entry_id, name, old_sha256, sha256) VALUES (?, ?, ?, ?)",
+                [(cur.lastrowid, name, old_sha256 or "", sha256) for name, old_sha256, sha256 in covers],
+            )
+        return cur.lastrowid
+
+    def announced(self, covers):
+        # only the latest transition per file counts, so A->B->A->B announces the second A->B again
+        found = set()
+        for name, old_sha256, sha256 in covers:
+            row = self.db.execute(
+                "SELECT old_sha256, sha256 FROM covers WHERE name = ? ORDER BY rowid DESC LIMIT 1", (name,)
+            ).fetchone()
+            if row and (row["old_sha256"], row["sha256"]) == (old_sha256 or "", sha256):
+                found.add((name, old_sha256, sha256))
+        return found
+
+    def mark_sent(self, entry_id, sent_count, message_id=None):
+        with self.db:
+            row = self.db.execute("SELECT message_ids FROM entries WHERE id = ?", (entry_id,)).fetchone()
+            ids = json.loads(row["message_ids"]) if row else []
+            if message_id is not None:
+                ids.append(message_id)
+            self.db.execute(
+                "UPDATE entries SET sent_count = ?, message_ids = ? WHERE id = ?",
+                (sent_count, json.dumps(ids), entry_id),
+            )
+
+    def mark_done(self, entry_id):
+        with self.db:
+            self.db.execute(
+                "UPDATE entries SET status = 'sent', finished_at = ? WHERE id = ?",
+                (datetime.now(timezone.utc).isoformat(), entry_id),
+            )
+
+    def mark_failed(self, entry_id, error, max_attempts):
+        with self.db:
+            self.db.execute(
+                "UPDATE entries SET attempts = attempts + 1, last_error = ?, finished_at = ?, "
+                "status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE status END WHERE id = ?",
+                (str(error), datetime.now(timezone.utc).isoformat(), max_attempts, entry_id),
+            )
+
+    def pending(self, backoff=0.0, max_backoff=3600.0, exclude=()):
+        now  = datetime.now(timezone.utc)
+        out  = []
+        rows = self.db.execute(
+            "SELECT id, friendly_name, messages, sent_count, attempts, finished_at FROM entries "
+            "WHERE status = 'pending' ORDER BY id"
+        ).fetchall()
+        for r in rows:
+            if r["id"] in exclude:
+                continue
+            if r["attempts"] and r["finished_at"]:
+                delay = min(backoff * 2 ** (r["attempts"] - 1), max_backoff)
+                if datetime.fromisoformat(r["finished_at"]) + timedelta(seconds=delay) > now:
+                    continue
+            out.append((r["id"], r["friendly_name"], decode_messages(r["messages"]), r["sent_count"]))
+        return out
+
+    def prune(self, keep_days=14):
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=keep_days)).isoformat()
+        with self.db:
+            self.db.execute(
+                "DELETE FROM covers WHERE entry_id IN "
+                "(SELECT id FROM entries WHERE status != 'pending' AND finished_at < ?)", (cutoff,)
+            )
+            cur = self.db.execute("DELETE FROM entries WHERE status != 'pending' AND finished_at < ?", (cutoff,))
+        return cur.rowcount
+
+    def summary(self):
+        rows = self.db.execute("SELECT status, COUNT(*) AS n FROM entries GROUP BY status").fetchall()
+        counts = {r["status"]: r["n"] for r in rows}
+        return f"{counts.get('pending', 0)} pending, {counts.get('sent', 0)} sent, {counts.get('failed', 0)} failed"
@@ -0,0 +1,129 @@
+import time
+import asyncio
+import logging
+from collections import deque
+
+from metrics import Registry
+
+
+class PublishJob:
+    __slots__ = ("friendly_name", "messages", "created", "journal_id", "sent")
+
+    def __init__(self, friendly_name, messages, journal_id=None, sent=0):
+        self.friendly_name = friendly_name
+        self.messages      = messages
+        self.created       = time.monotonic()
+        self.journal_id    = journal_id
+        self.sent          = sent
+
+
+class RateLimiter:
+    def __init__(self, limit, per):
+        self.limit = limit
+        self.per   = per
+        self.sent  = deque()
+
+    def defer(self, seconds):
+        until = time.monotonic() + seconds
+        self.sent.clear()
+        self.sent.extend([until - self.per] * self.limit)
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            while self.sent and now - self.sent[0] >= self.per:
+                self.sent.popleft()
+            if len(self.sent) < self.limit:
+                self.sent.append(now)
+                return
+            await asyncio.sleep(self.per - (now - self.sent[0]))
+
+
+class Publisher:
+    def __init__(self, maxsize=100, rate_limit=5, rate_per=5.0, max_retries=3, render=None, metrics=None,
+                 on_sent=None, on_done=None):
+        self.queue       = asyncio.Queue(maxsize)
+        self.render      = render or (lambda message: message)
+        self.on_sent     = on_sent
+        self.on_done     = on_done
+        self.limiter     = RateLimiter(rate_limit, rate_per)
+        self.max_retries = max_retries
+        self.stats = {
+            "enqueued":      0,
+            "published":     0,
+            "dropped":       0,
+            "failed":        0,
+            "messages":      0,
+            "rate_limited":  0,
+            "max_delay":     0.0,
+            "total_delay":   0.0,
+        }
+        metrics           = metrics or Registry()
+        self.send_seconds = metrics.histogram("discord_send_seconds", "channel.send latency")
+        self.queue_delay  = metrics.histogram("publish_queue_delay_seconds", "Time a job waited before publishing")
+
+    def submit(self, job):
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            logging.warning(f"[{job.friendly_name}] publish queue full ({self.queue.maxsize}) — dropping update")
+            return False
+        self.stats["enqueued"] += 1
+        return True
+
+    async def send(self, channel, message):
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            try:
+                with self.send_seconds.time():
+                    return await channel.send(**self.render(message))
+            except Exception as e:
+                if getattr(e, "status", None) != 429 or attempt == self.max_retries:
+                    raise
+                retry_after = float(getattr(e, "retry_after", None) or 1.0)
+                self.stats["rate_limited"] += 1
+                logging.info(f"Discord rate limit hit, retrying in {retry_after:.2f}s")
+                self.limiter.defer(retry_after)
+
+    async def publish(self, channel, job):
+        while job.sent < len(job.messages):
+            sent = await self.send(channel, job.messages[job.sent])
+            job.sent += 1
+            self.stats["messages"] += 1
+            if self.on_sent:
+                await self.on_sent(job, sent)
+
+    async def run(self, channel):
+        while True:
+            job = await self.queue.get()
+            delay = time.monotonic() - job.created
+            self.stats["max_delay"]    = max(self.stats["max_delay"], delay)
+            self.stats["total_delay"] += delay
+            self.queue_delay.observe(delay)
+            error = None
+            try:
+                await self.publish(channel, job)
+                self.stats["published"] += 1
+                logging.info(f"Published update for {job.friendly_name} ({len(job.messages)} messages, queued {delay:.2f}s)")
+            except Exception as e:
+                error = e
+                self.stats["failed"] += 1
+                logging.warning(f"[{job.friendly_name}] publish failed: {e}")
+            try:
+                if self.on_done:
+                    await self.on_done(job, error)
+            except Exception as e:
+                logging.warning(f"[{job.friendly_name}] publish bookkeeping failed: {e}")
+            finally:
+                self.queue.task_done()
+
+    def summary(self):
+        s = self.stats
+        done = s["published"] + s["failed"]
+        avg  = s["total_delay"] / done if done else 0.0
+        return (
+            f"depth {self.queue.qsize()}/{self.queue.maxsize}, {s['published']} published, "
+            f"{s['failed']} failed, {s['dropped']} dropped, {s['messages']} messages, "
+            f"{s['rate_limited']} rate-limited, delay avg {avg:.2f}s max {s['max_delay']:.2f}s"
+        )
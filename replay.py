@@ -0,0 +1,233 @@
+import os
+import sys
+import time
+import random
+import asyncio
+import hashlib
+import importlib
+import logging
+import resource
+import tempfile
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+from bench import load_snapshots, mutate
+
+STUB_HOST = "127.0.0.1"
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class StubCloudStorage:
+    def __init__(self, files):
+        self.files    = {}
+        self.entries  = {}
+        self.requests = {"token": 0, "listing": 0, "file": 0, "not_modified": 0}
+        for name, lines in files.items():
+            self.update(name, lines)
+
+    def update(self, name, lines):
+        data = "".join(lines).encode("utf-8")
+        ufn  = hashlib.sha1(name.encode("utf-8")).hexdigest()
+        self.files[ufn]   = data
+        self.entries[ufn] = {
+            "uniqueFilename": ufn,
+            "filename":       name,
+            "hash":           hashlib.sha1(data).hexdigest(),
+            "hash256":        hashlib.sha256(data).hexdigest(),
+            "length":         len(data),
+            "contentType":    "application/octet-stream",
+            "uploaded":       datetime.now(timezone.utc).isoformat(),
+            "storageType":    "S3",
+        }
+
+    async def token(self, request):
+        self.requests["token"] += 1
+        return web.json_response({
+            "access_token":    f"replay-{self.requests['token']}",
+            "expires_in":      3600,
+            "refresh_token":   "replay-refresh",
+            "refresh_expires": 8 * 3600,
+        })
+
+    async def listing(self, request):
+        self.requests["listing"] += 1
+        return web.json_response(list(self.entries.values()))
+
+    async def file(self, request):
+        ufn = request.match_info["ufn"]
+        if ufn not in self.files:
+            raise web.HTTPNotFound()
+        etag = f'"{self.entries[ufn]["hash"]}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.requests["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        self.requests["file"] += 1
+        return web.Response(body=self.files[ufn], headers={"ETag": etag}, content_type="text/plain")
+
+    async def start(self, port=0):
+        app = web.Application()
+        app.router.add_post("/token", self.token)
+        app.router.add_get("/system", self.listing)
+        app.router.add_get("/system/{ufn}", self.file)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, STUB_HOST, port).start()
+        return self.runner.addresses[0][1]
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+class FakeChannel:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.sent    = 0
+        self.embeds  = 0
+        self.files   = 0
+
+    async def send(self, content=None, embeds=None, files=None, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.sent   += 1
+        self.embeds += len(embeds or ())
+        self.files  += len(files or ())
+
+
+def configure_env(port, state_dir):
+    base = f"http://{STUB_HOST}:{port}"
+    os.environ.update({
+        "TOKEN_URL":          f"{base}/token",
+        "SYSTEM_API_URL":     f"{base}/system",
+        "STATE_DIR":          state_dir,
+        "PING_ROLE_ID":       "0",
+        "DISCORD_CHANNEL_ID": "0",
+        "METRICS_PORT":       "0",
+        "EPIC_CLIENT_SECRET": "replay",
+        "EPIC_DEVICE_ID":     "replay",
+        "EPIC_DEVICE_SECRET": "replay",
+        "EPIC_ACCOUNT_ID":    "replay",
+    })
+
+
+def load_main():
+    # main reads its endpoints and STATE_DIR at import; a second harness in the same process needs a fresh copy
+    if "main" in sys.modules:
+        return importlib.reload(sys.modules["main"])
+    import main
+    return main
+
+
+def stage_line(label, histogram):
+    count, total = histogram.totals()
+    if not count:
+        return f"{label:<10} {'-':>8}"
+    return f"{label:<10} {count:>8} {total / count * 1e3:>10.3f} {histogram.quantile(0.95) * 1e3:>10.3f}"
+
+
+async def replay(cycles=20, rate=0.02, files_per_cycle=3, send_latency=0.0, seed=1234, verbose=False):
+    snapshots = load_snapshots()
+    stub      = StubCloudStorage(snapshots)
+    port      = await stub.start()
+
+    with tempfile.TemporaryDirectory(prefix="replay-state-") as state_dir:
+        configure_env(port, state_dir)
+        main = load_main()
+        if not verbose:
+            logging.getLogger().setLevel(logging.WARNING)
+
+        bot     = main.FortniteTrackerBot()
+        channel = FakeChannel(send_latency)
+        bot.open_session()
+        bot.start_workers()
+        bot.loop_monitor.start()
+        await bot.tokens.refresh()
+        await bot.load_file_list()
+        bot.publisher = bot.make_publisher(rate_limit=1000, rate_per=1.0)
+        publisher_task = asyncio.create_task(bot.publisher.run(channel))
+
+        started = time.perf_counter()
+        await bot.poll_cycle([main.LISTING_KEY, *bot.filename_map])
+        await bot.publisher.queue.join()
+        seed_time = time.perf_counter() - started
+
+        rng     = random.Random(seed)
+        current = dict(snapshots)
+        names   = sorted(current)
+        started = time.perf_counter()
+        for _ in range(cycles):
+            for name in rng.sample(names, min(files_per_cycle, len(names))):
+                current[name] = mutate(current[name], rng, rate)
+                stub.update(name, current[name])
+            cycle_started = time.perf_counter()
+            await bot.poll_cycle([main.LISTING_KEY])
+            await bot.publisher.queue.join()
+            bot.cycle_seconds.observe(time.perf_counter() - cycle_started)
+        elapsed = time.perf_counter() - started
+
+        publisher_task.cancel()
+        await bot.shutdown()
+        await stub.stop()
+
+    print(f"{len(snapshots)} files, {cycles} cycles, {files_per_cycle} files x {rate:.0%} lines mutated per cycle")
+    print(f"seed cycle: {seed_time * 1e3:.1f} ms   replay: {elapsed:.2f}s   {cycles / elapsed:.2f} cycles/s")
+    print(f"{'stage':<10} {'count':>8} {'avg ms':>10} {'p95 ms':>10}")
+    print(stage_line("cycle", bot.cycle_seconds))
+    print(stage_line("fetch", bot.fetch_seconds))
+    print(stage_line("diff", bot.diff_seconds))
+    print(stage_line("parse", bot.parse_seconds))
+    print(stage_line("digest", bot.digest_seconds))
+    print(stage_line("send", bot.publisher.send_seconds))
+    print(f"event loop lag: {bot.loop_monitor.summary()}")
+    print(f"persistence: {bot.persist.summary()}")
+    print(f"text index: {bot.text_index.summary()}")
+    print(f"stub requests: {stub.requests}")
+    print(f"discord: {channel.sent} messages, {channel.embeds} embeds, {channel.files} files")
+    print(f"peak RSS: {peak_rss_mb():.1f} MiB")
+
+
+async def first_poll(main):
+    bot = main.FortniteTrackerBot()
+    await bot.setup_hook()
+    while bot.first_poll is None:
+        await asyncio.sleep(0.005)
+    await bot.shutdown()
+    return bot.first_poll
+
+
+async def restart(verbose=False):
+    stub = StubCloudStorage(load_snapshots())
+    port = await stub.start()
+
+    with tempfile.TemporaryDirectory(prefix="replay-state-") as state_dir:
+        configure_env(port, state_dir)
+        main = load_main()
+        if not verbose:
+            logging.getLogger().setLevel(logging.WARNING)
+
+        before = dict(stub.requests)
+        cold   = await first_poll(main)
+        mid    = dict(stub.requests)
+        warm   = await first_poll(main)
+        after  = dict(stub.requests)
+        await stub.stop()
+
+    print(f"cold start: first poll after {cold * 1e3:.1f} ms ({mid['token'] - before['token']} token, {mid['listing'] - before['listing']} listing requests)")
+    print(f"warm start: first poll after {warm * 1e3:.1f} ms ({after['token'] - mid['token']} token, {after['listing'] - mid['listing']} listing requests)")
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "-v"]
+    if args[:1] == ["restart"]:
+        asyncio.run(restart(verbose="-v" in sys.argv))
+        sys.exit(0)
+    asyncio.run(replay(
+        cycles=int(args[0]) if len(args) > 0 else 20,
+        rate=float(args[1]) if len(args) > 1 else 0.02,
+        files_per_cycle=int(args[2]) if len(args) > 2 else 3,
+        verbose="-v" in sys.argv,
+    ))
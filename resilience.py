@@ -0,0 +1,168 @@
+import time
+import random
+import asyncio
+import logging
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+
+TRANSIENT_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+GONE_STATUSES      = {404, 410}
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+def retry_after_seconds(headers):
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify(error):
+    if isinstance(error, aiohttp.ClientResponseError):
+        if error.status in TRANSIENT_STATUSES:
+            return "transient"
+        if error.status in GONE_STATUSES:
+            return "gone"
+        return "permanent"
+    if isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+        return "transient"
+    return "permanent"
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=60.0, max_reset_timeout=3600.0):
+        self.failure_threshold = failure_threshold
+        self.base_timeout      = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout     = reset_timeout
+        self.failures          = 0
+        self.state             = "closed"
+        self.opened_at         = 0.0
+
+    def allow(self):
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+        return True
+
+    def record_success(self):
+        self.failures      = 0
+        self.state         = "closed"
+        self.reset_timeout = self.base_timeout
+
+    def record_failure(self, kind):
+        self.failures += 1
+        if self.state == "half_open":
+            self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            self._open()
+        elif kind == "gone":
+            self.reset_timeout = self.max_reset_timeout
+            self._open()
+        elif self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        self.state     = "open"
+        self.opened_at = time.monotonic()
+
+
+class EndpointStats:
+    __slots__ = ("requests", "successes", "retries", "errors", "latency_total", "latency_max", "last_error")
+
+    def __init__(self):
+        self.requests      = 0
+        self.successes     = 0
+        self.retries       = 0
+        self.errors        = {}
+        self.latency_total = 0.0
+        self.latency_max   = 0.0
+        self.last_error    = None
+
+    def observe(self, latency):
+        self.requests      += 1
+        self.latency_total += latency
+        self.latency_max    = max(self.latency_max, latency)
+
+
+class Resilience:
+    def __init__(self, max_retries=3, base_delay=0.5, max_delay=30.0,
+                 failure_threshold=5, reset_timeout=60.0):
+        self.max_retries       = max_retries
+        self.base_delay        = base_delay
+        self.max_delay         = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout     = reset_timeout
+        self.breakers          = {}
+        self.stats             = {}
+
+    def breaker(self, key):
+        if key not in self.breakers:
+            self.breakers[key] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return self.breakers[key]
+
+    def endpoint(self, key):
+        if key not in self.stats:
+            self.stats[key] = EndpointStats()
+        return self.stats[key]
+
+    def forget(self, key):
+        self.breakers.pop(key, None)
+        self.stats.pop(key, None)
+
+    def backoff(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def call(self, key, fn):
+        breaker = self.breaker(key)
+        stats   = self.endpoint(key)
+        if not breaker.allow():
+            raise CircuitOpenError(f"circuit open for {key} ({breaker.failures} failures)")
+
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                result = await fn()
+            except Exception as e:
+                stats.observe(time.perf_counter() - started)
+                kind = classify(e)
+                stats.errors[kind] = stats.errors.get(kind, 0) + 1
+                stats.last_error   = f"{type(e).__name__}: {e}"
+                if kind != "transient" or attempt == self.max_retries:
+                    breaker.record_failure(kind)
+                    raise
+                delay = retry_after_seconds(getattr(e, "headers", None))
+                if delay is None:
+                    delay = self.backoff(attempt)
+                stats.retries += 1
+                logging.info(f"[{key}] transient error ({e}); retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+                await asyncio.sleep(min(delay, self.max_delay))
+                continue
+            stats.observe(time.perf_counter() - started)
+            stats.successes += 1
+            breaker.record_success()
+            return result
+
+    def summary(self):
+        open_keys = [k for k, b in self.breakers.items() if b.state == "open"]
+        requests  = sum(s.requests for s in self.stats.values())
+        retries   = sum(s.retries for s in self.stats.values())
+        errors    = sum(sum(s.errors.values()) for s in self.stats.values())
+        slowest   = sorted(self.stats.items(), key=lambda kv: kv[1].latency_max, reverse=True)[:3]
+        slow_txt  = ", ".join(f"{k} {s.latency_max * 1000:.0f}ms" for k, s in slowest if s.requests)
+        return (
+            f"{requests} requests, {retries} retries, {errors} errors, "
+            f"{len(open_keys)} open breakers{': ' + ', '.join(open_keys) if open_keys else ''}"
+            f"{'; slowest ' + slow_txt if slow_txt else ''}"
+        )
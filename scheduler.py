@@ -0,0 +1,88 @@
+import time
+import heapq
+import random
+
+
+class PollScheduler:
+    def __init__(self, grow=1.5, shrink=0.5, burst_window=300.0):
+        self.grow         = grow
+        self.shrink       = shrink
+        self.burst_window = burst_window
+        self.burst_until  = 0.0
+        self.heap         = []
+        self.due_at       = {}
+        self.intervals    = {}
+        self.bounds       = {}
+        self.stats        = {"polls": 0, "changes": 0, "bursts": 0}
+
+    def __contains__(self, key):
+        return key in self.intervals
+
+    def add(self, key, min_interval, max_interval, interval=None, delay=None):
+        if key in self.intervals:
+            return
+        interval = interval if interval is not None else max_interval
+        self.bounds[key]    = (min_interval, max_interval)
+        self.intervals[key] = interval
+        self.schedule(key, random.uniform(0, interval) if delay is None else delay)
+
+    def remove(self, key):
+        self.due_at.pop(key, None)
+        self.intervals.pop(key, None)
+        self.bounds.pop(key, None)
+
+    def schedule(self, key, delay, now=None):
+        due = (now or time.monotonic()) + max(0.0, delay)
+        self.due_at[key] = due
+        heapq.heappush(self.heap, (due, key))
+
+    def _prune(self):
+        while self.heap and self.due_at.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+
+    def wait_time(self, now=None):
+        self._prune()
+        if not self.heap:
+            return None
+        return max(0.0, self.heap[0][0] - (now or time.monotonic()))
+
+    def pop_due(self, now=None):
+        now = now or time.monotonic()
+        due = []
+        self._prune()
+        while self.heap and self.heap[0][0] <= now:
+            _, key = heapq.heappop(self.heap)
+            if self.due_at.get(key) is not None:
+                del self.due_at[key]
+                due.append(key)
+            self._prune()
+        return due
+
+    def in_burst(self, now=None):
+        return (now or time.monotonic()) < self.burst_until
+
+    def observe(self, key, changed, now=None):
+        if key not in self.intervals:
+            return
+        now = now or time.monotonic()
+        low, high = self.bounds[key]
+        interval  = self.intervals[key]
+        if changed:
+            interval = max(low, interval * self.shrink)
+            self.stats["changes"] += 1
+        else:
+            interval = min(high, interval * self.grow)
+        self.intervals[key] = interval
+        self.stats["polls"] += 1
+        self.schedule(key, low if self.in_burst(now) else interval, now)
+
+    def burst(self, now=None):
+        now = now or time.monotonic()
+        if self.in_burst(now):
+            self.burst_until = now + self.burst_window
+            return False
+        self.burst_until = now + self.burst_window
+        self.stats["bursts"] += 1
+        for key in list(self.due_at):
+            self.schedule(key, 0.0, now)
+        return True
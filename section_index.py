@@ -0,0 +1,78 @@
+import re
+import hashlib
+from collections import Counter
+
+CHUNK_MASK      = 63
+MAX_CHUNK_BYTES = 64 * 1024
+
+HEADER_LINE = rb"[ \t]*\[([^\r\n]*)\][ \t\r]*(?=\n|\Z)"
+HEADER_RE   = re.compile(rb"(?:\xef\xbb\xbf)?" + HEADER_LINE)  # some files start with a UTF-8 BOM
+HEADERS_RE  = re.compile(rb"\n" + HEADER_LINE)
+
+
+def find_headers(data):
+    first   = HEADER_RE.match(data)
+    headers = [(0, first.group(1).decode("utf-8", "replace"))] if first else []
+    headers.extend((m.start() + 1, m.group(1).decode("utf-8", "replace")) for m in HEADERS_RE.finditer(data))
+    return headers
+
+
+def _digest(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def section_table(data, mask=CHUNK_MASK, max_bytes=MAX_CHUNK_BYTES):
+    view    = memoryview(data)
+    bounds  = [(0, "")] + find_headers(data)
+    bounds.append((len(data), None))
+    table   = []
+    for (start, name), (end, _) in zip(bounds, bounds[1:]):
+        if end <= start:
+            continue
+        chunk, line = start, start
+        pos = data.find(b"\n", start, end)
+        while pos != -1:
+            last = data[pos - 1] if pos > line else 0
+            if ((pos - line) * 2654435761 + last) & mask == mask or pos + 1 - chunk >= max_bytes:
+                table.append((name, chunk, pos + 1, _digest(view[chunk:pos + 1])))
+                chunk = pos + 1
+            line = pos + 1
+            pos  = data.find(b"\n", line, end)
+        if chunk < end:
+            table.append((name, chunk, end, _digest(view[chunk:end])))
+    return table
+
+
+def changed_chunks(old_table, new_table):
+    pool    = Counter(e[3] for e in old_table)
+    new_out = []
+    for e in new_table:
+        if pool[e[3]] > 0:
+            pool[e[3]] -= 1
+        else:
+            new_out.append(e)
+    old_out = []
+    for e in old_table:
+        if pool[e[3]] > 0:
+            pool[e[3]] -= 1
+            old_out.append(e)
+    return old_out, new_out
+
+
+def chunk_lines(data, chunks):
+    return [l for _, start, end, _ in chunks for l in data[start:end].decode("utf-8").splitlines(keepends=True)]
+
+
+def section_spans(data, table):
+    spans = []
+    for name, start, end, digest in table:
+        if spans and spans[-1][0] == name and not HEADER_RE.match(data, start):
+            spans[-1][2] = end
+            spans[-1][3].append(digest)
+        else:
+            spans.append([name, start, end, [digest]])
+    return [
+        (name, _digest("".join(digests).encode("ascii")),
+         lambda start=start, end=end: data[start:end].decode("utf-8").splitlines(keepends=True))
+        for name, start, end, digests in spans
+    ]
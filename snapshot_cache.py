@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+class Snapshot:
+    __slots__ = ("digest", "data", "size")
+
+    def __init__(self, digest, data):
+        self.digest = digest
+        self.data   = data
+        self.size   = len(data)
+
+
+class SnapshotCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries   = OrderedDict()
+        self.total     = 0
+        self.stats     = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def _touch(self, name):
+        snap = self.entries.get(name)
+        if snap is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self.entries.move_to_end(name)
+        return snap
+
+    def digest(self, name):
+        snap = self._touch(name)
+        return snap.digest if snap else None
+
+    def data(self, name):
+        snap = self._touch(name)
+        return snap.data if snap else None
+
+    def put(self, name, digest, data):
+        self.discard(name)
+        snap = Snapshot(digest, data)
+        if snap.size > self.max_bytes:
+            return
+        self.entries[name] = snap
+        self.total += snap.size
+        self._evict(keep=name)
+
+    def discard(self, name):
+        snap = self.entries.pop(name, None)
+        if snap is not None:
+            self.total -= snap.size
+
+    def _evict(self, keep=None):
+        while self.total > self.max_bytes and self.entries:
+            name, snap = next(iter(self.entries.items()))
+            if name == keep:
+                if len(self.entries) == 1:
+                    break
+                self.entries.move_to_end(name)
+                continue
+            del self.entries[name]
+            self.total -= snap.size
+            self.stats["evictions"] += 1
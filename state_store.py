@@ -0,0 +1,180 @@
+import os
+import sys
+import gzip
+import json
+import hashlib
+import logging
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+EXTENSIONS     = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+RESERVED_FILES = {"manifest.json", "validators.json", "checkpoint.json"}
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def atomic_write(path, data, mode=0o644):
+    tmp = f"{path}.tmp"
+    with open(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode), "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _compress(data, method):
+    if method == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if method == "zstd":
+        return zstandard.ZstdCompressor(level=6).compress(data)
+    return data
+
+
+def _decompress(data, method):
+    if method == "gzip":
+        return gzip.decompress(data)
+    if method == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+class StateStore:
+    def __init__(self, root, compression="gzip"):
+        if compression == "zstd" and zstandard is None:
+            logging.warning("zstandard is not installed; falling back to gzip state compression.")
+            compression = "gzip"
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Unknown state compression: {compression}")
+
+        self.root          = root
+        self.compression   = compression
+        self.objects_dir   = os.path.join(root, "objects")
+        self.manifest_path = os.path.join(root, "manifest.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self.manifest = {}
+        if os.path.isfile(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+        self.dirty   = False
+        self.garbage = {}
+        self.stats   = {"reads": 0, "writes": 0, "bytes_read": 0, "bytes_written": 0}
+
+    def _object_path(self, digest, method):
+        return os.path.join(self.objects_dir, f"{digest}{EXTENSIONS[method]}")
+
+    def _index_path(self, digest):
+        return os.path.join(self.objects_dir, f"{digest}.sections.json")
+
+    def _legacy_path(self, name):
+        return os.path.join(self.root, f"{name}.json")
+
+    def save_manifest(self):
+        atomic_write(self.manifest_path, json.dumps(self.manifest, indent=2, sort_keys=True).encode("utf-8"))
+        self.dirty = False
+        # only blobs the saved manifest no longer references are safe to delete
+        live = {e["sha256"] for e in self.manifest.values()}
+        garbage, self.garbage = self.garbage, {}
+        for digest, method in garbage.items():
+            if digest in live:
+                continue
+            for path in (self._object_path(digest, method), self._index_path(digest)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def has(self, name):
+        return name in self.manifest or os.path.isfile(self._legacy_path(name))
+
+    def digest(self, name):
+        entry = self.manifest.get(name)
+        if entry is None and self.migrate(name):
+            entry = self.manifest[name]
+        return entry["sha256"] if entry else None
+
+    def load(self, name):
+        entry = self.manifest.get(name)
+        if entry is None and self.migrate(name):
+            entry = self.manifest[name]
+        if entry is None:
+            return None
+        with open(self._object_path(entry["sha256"], entry["compression"]), "rb") as f:
+            blob = f.read()
+        self.stats["reads"]      += 1
+        self.stats["bytes_read"] += len(blob)
+        return _decompress(blob, entry["compression"])
+
+    def load_index(self, digest):
+        try:
+            with open(self._index_path(digest), "r", encoding="utf-8") as f:
+                return [tuple(e) for e in json.load(f)]
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put_index(self, digest, table):
+        path = self._index_path(digest)
+        if not os.path.isfile(path):
+            atomic_write(path, json.dumps(table, separators=(",", ":")).encode("utf-8"))
+
+    def put(self, name, data, digest=None, save=True):
+        digest = digest or content_hash(data)
+        old    = self.manifest.get(name)
+        if old and old["sha256"] == digest:
+            return digest
+
+        path = self._object_path(digest, self.compression)
+        if not os.path.isfile(path):
+            blob = _compress(data, self.compression)
+            atomic_write(path, blob)
+            self.stats["writes"]        += 1
+            self.stats["bytes_written"] += len(blob)
+
+        self.manifest[name] = {"sha256": digest, "size": len(data), "compression": self.compression}
+        self.dirty          = True
+        if old:
+            self.garbage[old["sha256"]] = old["compression"]
+        if save:
+            self.save_manifest()
+        return digest
+
+    def migrate(self, name, save=True):
+        legacy = self._legacy_path(name)
+        if name in self.manifest or not os.path.isfile(legacy):
+            return False
+        with open(legacy, "r", encoding="utf-8") as f:
+            lines = json.load(f)
+        self.put(name, "".join(lines).encode("utf-8"), save=save)
+        logging.info(f"[{name}] Migrated legacy JSON state to {self.compression} object store.")
+        return True
+
+    def migrate_all(self):
+        migrated = 0
+        for fname in sorted(os.listdir(self.root)):
+            if not fname.endswith(".json") or fname.endswith("_parsed.json"):
+                continue
+            if fname in RESERVED_FILES:
+                continue
+            if self.migrate(fname[:-len(".json")], save=False):
+                migrated += 1
+        stray = [n for n in self.manifest if f"{n}.json" in RESERVED_FILES]
+        for name in stray:
+            logging.warning(f"[{name}] Dropping bookkeeping file wrongly migrated into the object store.")
+            old = self.manifest.pop(name)
+            self.garbage[old["sha256"]] = old["compression"]
+            self.dirty = True
+        if migrated or stray:
+            self.save_manifest()
+        return migrated
+
+
+if __name__ == "__main__":
+    root  = sys.argv[1] if len(sys.argv) > 1 else "state"
+    store = StateStore(root, os.getenv("STATE_COMPRESSION", "gzip"))
+    print(f"Migrated {store.migrate_all()} legacy state files into {store.objects_dir}")
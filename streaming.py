@@ -0,0 +1,33 @@
+import hashlib
+
+CHUNK_SIZE = 64 * 1024
+
+
+class StreamingBody:
+    __slots__ = ("hasher", "buffer", "encoding", "chunks")
+
+    def __init__(self, encoding="utf-8"):
+        self.hasher   = hashlib.sha256()
+        self.buffer   = bytearray()
+        self.encoding = encoding
+        self.chunks   = 0
+
+    def feed(self, chunk):
+        self.hasher.update(chunk)
+        self.buffer += chunk
+        self.chunks += 1
+
+    @property
+    def size(self):
+        return len(self.buffer)
+
+    @property
+    def digest(self):
+        return self.hasher.hexdigest()
+
+    @property
+    def data(self):
+        return self.buffer
+
+    def text(self):
+        return self.buffer.decode(self.encoding)
@@ -0,0 +1,30 @@
+import os
+import asyncio
+
+from persistence import Persistence
+from state_store import StateStore, content_hash
+
+
+def test_manifest_saved_only_when_dirty(tmp_path):
+    store = StateStore(str(tmp_path), "gzip")
+    saves = []
+    save  = store.save_manifest
+    store.save_manifest = lambda: (saves.append(1), save())
+
+    data   = b"[Core.Log]\nLogNet=Log\n"
+    digest = content_hash(data)
+
+    async def run():
+        persist = Persistence(store)
+        persist.put_snapshot("DefaultGame.ini", data, digest, [])
+        await persist.flush()
+        persist.write(store.put_index, digest, [])
+        await persist.flush()
+        persist.put_snapshot("DefaultGame.ini", data, digest, [])
+        await persist.flush()
+        await persist.close()
+
+    asyncio.run(run())
+    assert len(saves) == 1
+    assert not store.dirty
+    assert os.path.isfile(store.manifest_path)
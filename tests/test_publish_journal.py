@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from persistence import Persistence
+from publish_journal import PublishJournal
+
+MESSAGES = [
+    {"content": "DefaultGame.ini changed", "attachments": [("diff.txt", b"+a\n-b\n")]},
+    {"content": "part 2"},
+]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "journal.sqlite3")
+
+
+def test_append_crash_resubmit(path):
+    journal  = PublishJournal(path)
+    entry_id = journal.append("cycle digest", MESSAGES, [("DefaultGame.ini", "a", "b")])
+    journal.mark_sent(entry_id, 1, 111)
+    journal.close()
+
+    journal = PublishJournal(path)
+    assert journal.pending() == [(entry_id, "cycle digest", MESSAGES, 1)]
+    assert journal.pending(exclude={entry_id}) == []
+
+    journal.mark_sent(entry_id, 2, 222)
+    journal.mark_done(entry_id)
+    journal.close()
+
+    journal = PublishJournal(path)
+    assert journal.pending() == []
+    assert journal.summary() == "0 pending, 1 sent, 0 failed"
+    journal.close()
+
+
+def test_failed_append_flushes_nothing(path):
+    class Store:
+        def __init__(self):
+            self.written = []
+            self.dirty   = False
+
+        def put(self, name, data, digest, save=True):
+            self.written.append(name)
+
+        def put_index(self, digest, table):
+            pass
+
+        def save_manifest(self):
+            pass
+
+    async def cycle(journal):
+        persist = Persistence(Store())
+        persist.put_snapshot("DefaultGame.ini", b"data", "b", [])
+        try:
+            await persist.run(journal.append, "cycle digest", MESSAGES, [("DefaultGame.ini", "a", "b")])
+        except Exception:
+            dropped = persist.discard()
+        await persist.close()
+        return dropped, persist.store.written
+
+    journal = PublishJournal(path)
+    journal.close()
+    with pytest.raises(Exception):
+        journal.append("cycle digest", MESSAGES)
+    assert asyncio.run(cycle(journal)) == (2, [])
+
+
+def test_announced_follows_latest_transition(path):
+    journal = PublishJournal(path)
+    journal.append("cycle digest", MESSAGES, [("DefaultGame.ini", "A", "B")])
+    assert journal.announced([("DefaultGame.ini", "A", "B")]) == {("DefaultGame.ini", "A", "B")}
+    assert journal.announced([("DefaultGame.ini", "B", "A")]) == set()
+
+    journal.append("cycle digest", MESSAGES, [("DefaultGame.ini", "B", "A")])
+    assert journal.announced([("DefaultGame.ini", "B", "A")]) == {("DefaultGame.ini", "B", "A")}
+    assert journal.announced([("DefaultGame.ini", "A", "B")]) == set()
+
+    journal.append("cycle digest", MESSAGES, [("DefaultGame.ini", "A", "B")])
+    assert journal.announced([("DefaultGame.ini", "A", "B"), ("DefaultEngine.ini", None, "C")]) == {("DefaultGame.ini", "A", "B")}
+    journal.close()
+
+
+def test_announced_first_version(path):
+    journal = PublishJournal(path)
+    journal.append("cycle digest", MESSAGES, [("DefaultGame.ini", None, "A")])
+    assert journal.announced([("DefaultGame.ini", None, "A")]) == {("DefaultGame.ini", None, "A")}
+    journal.close()
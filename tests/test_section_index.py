@@ -0,0 +1,21 @@
+from section_index import find_headers, section_spans, section_table
+
+DATA = b"[/Script/FortniteGame.FortRuntimeOptions]\r\n+DisabledFrontendNavigationTabs=(TabName=\"AthenaStore\")\r\n\r\n[Core.Log]\r\nLogNet=Log\r\n"
+
+
+def test_headers_without_bom():
+    assert find_headers(DATA) == [(0, "/Script/FortniteGame.FortRuntimeOptions"), (DATA.index(b"[Core.Log]"), "Core.Log")]
+
+
+def test_first_header_after_bom():
+    data = b"\xef\xbb\xbf" + DATA
+    assert find_headers(data) == [(0, "/Script/FortniteGame.FortRuntimeOptions"), (data.index(b"[Core.Log]"), "Core.Log")]
+    table = section_table(data)
+    assert [e[0] for e in table][0] == "/Script/FortniteGame.FortRuntimeOptions"
+    assert "" not in {e[0] for e in table}
+    assert [name for name, _, _ in section_spans(data, table)] == ["/Script/FortniteGame.FortRuntimeOptions", "Core.Log"]
+
+
+def test_bom_only_counts_at_start():
+    data = DATA + b"\xef\xbb\xbf[Other]\r\n"
+    assert [name for _, name in find_headers(data)] == ["/Script/FortniteGame.FortRuntimeOptions", "Core.Log"]
@@ -0,0 +1,25 @@
+from text_index import TextIndex
+
+FULL = [("Title", "en", "Battle Royale"), ("Title", "de", "Battle Royale"), ("Play", "en", "Play now")]
+
+
+def test_update_rebuilds_when_not_at_old_version(tmp_path):
+    index = TextIndex(str(tmp_path / "index.sqlite3"))
+    index.update("DefaultGame.ini", "B", [("Play", "en", "Play now")], [], old_sha256="A", strings=lambda: FULL)
+    assert sorted(index.live("DefaultGame.ini")) == sorted(FULL)
+    assert index.files() == {"DefaultGame.ini": "B"}
+
+    index.update("DefaultGame.ini", "C", [], [("Play", "en", "Play now")], old_sha256="B", strings=lambda: 1 / 0)
+    assert sorted(index.live("DefaultGame.ini")) == sorted(FULL[:2])
+    index.close()
+
+
+def test_update_after_drop_rebuilds(tmp_path):
+    index = TextIndex(str(tmp_path / "index.sqlite3"))
+    index.rebuild("DefaultGame.ini", "A", FULL)
+    index.drop("DefaultGame.ini")
+    assert index.live("DefaultGame.ini") == []
+    index.update("DefaultGame.ini", "B", [], [], old_sha256="A", strings=lambda: FULL)
+    assert sorted(index.live("DefaultGame.ini")) == sorted(FULL)
+    assert len(index.search("battle royale", current=True)) == 2
+    index.close()
@@ -0,0 +1,171 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import unicodedata
+from collections import Counter
+from datetime import datetime, timezone
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS strings (
+    id          INTEGER PRIMARY KEY,
+    file        TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    locale      TEXT NOT NULL,
+    text        TEXT NOT NULL,
+    added_sha   TEXT,
+    added_at    TEXT NOT NULL,
+    removed_sha TEXT,
+    removed_at  TEXT
+);
+CREATE TABLE IF NOT EXISTS postings (
+    token     TEXT NOT NULL,
+    string_id INTEGER NOT NULL,
+    PRIMARY KEY (token, string_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS indexed (
+    name       TEXT PRIMARY KEY,
+    sha256     TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_strings_live ON strings(file, key, locale) WHERE removed_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_strings_key  ON strings(key, id);
+"""
+
+MARKUP_RE = re.compile(r"<[^>]*>|\\[nrt]")
+TOKEN_RE  = re.compile(r"(?P<s>[\u0e00-\u0e7f\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af\uf900-\ufaff]+)|(?P<w>[^\W_]+)")
+
+
+def tokenize(text):
+    # scripts written without spaces are indexed as overlapping character bigrams
+    out = set()
+    for m in TOKEN_RE.finditer(MARKUP_RE.sub(" ", unicodedata.normalize("NFKC", text).casefold())):
+        run = m.group("s")
+        if run is None:
+            out.add(m.group("w"))
+        elif len(run) == 1:
+            out.add(run)
+        else:
+            out.update(run[i:i + 2] for i in range(len(run) - 1))
+    return out
+
+
+class TextIndex:
+    def __init__(self, path):
+        self.path  = path
+        self.db    = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.db.commit()
+        self.stats = {"updates": 0, "added": 0, "removed": 0, "queries": 0, "query_time": 0.0}
+
+    def close(self):
+        self.db.close()
+
+    def files(self):
+        return {r["name"]: r["sha256"] for r in self.db.execute("SELECT name, sha256 FROM indexed")}
+
+    def live(self, file):
+        return [
+            (r["key"], r["locale"], r["text"])
+            for r in self.db.execute("SELECT key, locale, text FROM strings WHERE file = ? AND removed_at IS NULL", (file,))
+        ]
+
+    def update(self, file, sha256, added, removed, seen_at=None, old_sha256=None, strings=None):
+        if strings is not None:
+            row = self.db.execute("SELECT sha256 FROM indexed WHERE name = ?", (file,)).fetchone()
+            if (row["sha256"] if row else None) != old_sha256:
+                # a diff only applies to the version it was taken against; otherwise index the whole file
+                added, removed = strings(), self.live(file)
+        seen_at = seen_at or datetime.now(timezone.utc).isoformat()
+        plus    = Counter(tuple(s) for s in added)
+        minus   = Counter(tuple(s) for s in removed)
+        plus, minus = plus - minus, minus - plus
+        with self.db:
+            for (key, locale, text), n in minus.items():
+                self.db.execute(
+                    "UPDATE strings SET removed_sha = ?, removed_at = ? WHERE id IN ("
+                    "SELECT id FROM strings WHERE file = ? AND key = ? AND locale = ? AND text = ? "
+                    "AND removed_at IS NULL ORDER BY id LIMIT ?)",
+                    (sha256, seen_at, file, key, locale, text, n),
+                )
+            for (key, locale, text), n in plus.items():
+                tokens = tokenize(text) | tokenize(key)
+                for _ in range(n):
+                    cur = self.db.execute(
+                        "INSERT INTO strings (file, key, locale, text, added_sha, added_at) VALUES (?, ?, ?, ?, ?, ?)",
+                        (file, key, locale, text, sha256, seen_at),
+                    )
+                    self.db.executemany(
+                        "INSERT OR IGNORE INTO postings (token, string_id) VALUES (?, ?)",
+                        [(t, cur.lastrowid) for t in tokens],
+                    )
+            self.db.execute(
+                "INSERT INTO indexed (name, sha256, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET sha256 = excluded.sha256, updated_at = excluded.updated_at",
+                (file, sha256, seen_at),
+            )
+        self.stats["updates"] += 1
+        self.stats["added"]   += sum(plus.values())
+        self.stats["removed"] += sum(minus.values())
+
+    def rebuild(self, file, sha256, strings):
+        self.update(file, sha256, strings, self.live(file))
+
+    def drop(self, file):
+        self.update(file, None, [], self.live(file))
+
+    def search(self, query, locale=None, file=None, current=False, limit=50):
+        started = time.perf_counter()
+        tokens  = sorted(tokenize(query))
+        if not tokens:
+            return []
+        clauses = [f"s.id IN ({' INTERSECT '.join(['SELECT string_id FROM postings WHERE token = ?'] * len(tokens))})"]
+        params  = list(tokens)
+        for column, value in (("s.locale", locale), ("s.file", file)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if current:
+            clauses.append("s.removed_at IS NULL")
+        rows = self.db.execute(
+            "SELECT s.file, s.key, s.locale, s.text, s.added_sha, s.added_at, s.removed_sha, s.removed_at "
+            f"FROM strings s WHERE {' AND '.join(clauses)} ORDER BY s.id DESC LIMIT ?",
+            params + [limit],
+        ).fetchall()
+        self.stats["queries"]    += 1
+        self.stats["query_time"] += time.perf_counter() - started
+        return [dict(r) for r in rows]
+
+    def history(self, key, locale=None, file=None):
+        clauses, params = ["key = ?"], [key]
+        for column, value in (("locale", locale), ("file", file)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return [dict(r) for r in self.db.execute(
+            "SELECT file, key, locale, text, added_sha, added_at, removed_sha, removed_at "
+            f"FROM strings WHERE {' AND '.join(clauses)} ORDER BY id",
+            params,
+        )]
+
+    def summary(self):
+        avg = self.stats["query_time"] / self.stats["queries"] * 1e3 if self.stats["queries"] else 0.0
+        return (f"{self.stats['updates']} updates (+{self.stats['added']}/-{self.stats['removed']} strings), "
+                f"{self.stats['queries']} queries (avg {avg:.3f} ms)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("search", "key"):
+        print("usage: text_index.py {search|key} <value> [locale] [db]")
+        sys.exit(1)
+    kind, value = sys.argv[1], sys.argv[2]
+    locale      = sys.argv[3] if len(sys.argv) > 3 and sys.argv[3] != "-" else None
+    db_path     = sys.argv[4] if len(sys.argv) > 4 else os.path.join("state", "text_index.sqlite3")
+    index       = TextIndex(db_path)
+    result      = index.search(value, locale) if kind == "search" else index.history(value, locale)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -0,0 +1,137 @@
+import time
+import asyncio
+import logging
+from datetime import datetime
+
+import aiohttp
+
+
+def _expiry(payload, seconds_key, at_key, default):
+    if payload.get(seconds_key):
+        return time.time() + float(payload[seconds_key])
+    if payload.get(at_key):
+        try:
+            return datetime.fromisoformat(payload[at_key].replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return time.time() + default
+
+
+class TokenManager:
+    def __init__(self, session, token_url, client_secret, device_id, device_secret, account_id,
+                 refresh_margin=120):
+        self.session        = session
+        self.token_url      = token_url
+        self.client_secret  = client_secret
+        self.device_id      = device_id
+        self.device_secret  = device_secret
+        self.account_id     = account_id
+        self.refresh_margin = refresh_margin
+
+        self.access_token       = None
+        self.expires_at         = 0.0
+        self.refresh_token      = None
+        self.refresh_expires_at = 0.0
+
+        self._inflight = None
+        self._task     = None
+        self.stats     = {"refreshes": 0, "device_auths": 0, "failures": 0}
+
+    def export(self):
+        return {
+            "access_token":       self.access_token,
+            "expires_at":         self.expires_at,
+            "refresh_token":      self.refresh_token,
+            "refresh_expires_at": self.refresh_expires_at,
+        }
+
+    def restore(self, state):
+        if not state:
+            return
+        self.access_token       = state.get("access_token")
+        self.expires_at         = state.get("expires_at", 0.0)
+        self.refresh_token      = state.get("refresh_token")
+        self.refresh_expires_at = state.get("refresh_expires_at", 0.0)
+
+    def valid(self, margin=0):
+        return self.access_token is not None and time.time() < self.expires_at - margin
+
+    async def get_token(self):
+        if not self.valid():
+            await self.refresh()
+        return self.access_token
+
+    async def refresh(self, stale_token=None):
+        if stale_token is not None and stale_token != self.access_token:
+            return self.access_token
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._refresh())
+            self._inflight.add_done_callback(lambda _: setattr(self, "_inflight", None))
+        await asyncio.shield(self._inflight)
+        return self.access_token
+
+    async def _refresh(self):
+        try:
+            if self.refresh_token and time.time() < self.refresh_expires_at - self.refresh_margin:
+                data = {
+                    "grant_type":    "refresh_token",
+                    "refresh_token": self.refresh_token,
+                    "token_type":    "eg1"
+                }
+                try:
+                    await self._grant(data, {"X-Epic-Device-ID": "device_auth"})
+                    self.stats["refreshes"] += 1
+                    logging.info("Refreshed access token.")
+                    return
+                except aiohttp.ClientResponseError as e:
+                    if e.status not in (400, 401):
+                        raise
+                    logging.info(f"Refresh token rejected ({e.status}); falling back to device auth.")
+            data = {
+                "grant_type":   "device_auth",
+                "device_id":    self.device_id,
+                "secret":       self.device_secret,
+                "account_id":   self.account_id,
+                "token_type":   "eg1"
+            }
+            await self._grant(data)
+            self.stats["device_auths"] += 1
+            logging.info("Obtained new device auth session.")
+        except Exception:
+            self.stats["failures"] += 1
+            raise
+
+    async def _grant(self, data, extra_headers=None):
+        headers = {
+            "Content-Type":  "application/x-www-form-urlencoded",
+            "Authorization": f"Basic {self.client_secret}",
+        }
+        if extra_headers:
+            headers.update(extra_headers)
+        async with self.session.post(self.token_url, data=data, headers=headers) as resp:
+            resp.raise_for_status()
+            j = await resp.json()
+        self.access_token       = j["access_token"]
+        self.expires_at         = _expiry(j, "expires_in", "expires_at", 14 * 60)
+        self.refresh_token      = j.get("refresh_token", self.refresh_token)
+        self.refresh_expires_at = _expiry(j, "refresh_expires", "refresh_expires_at", 8 * 60 * 60)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._keep_fresh())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    async def _keep_fresh(self):
+        while True:
+            now  = time.time()
+            wait = max(self.expires_at - self.refresh_margin, (now + self.expires_at) / 2) - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logging.warning(f"Background token refresh failed: {e}")
+                await asyncio.sleep(30)